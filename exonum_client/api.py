@@ -7,25 +7,43 @@ This module provides several API classes:
   - PrivateApi: a subclass of class Api that provides methods to interact with private API of an Exonum node.
   - ServiceApi: a class that provides methods to interact with node services.
 """
-from typing import Optional, Any, Union, List, Dict, Iterable
+from typing import Optional, Any, Union, List, Dict, Iterable, TypeVar
 
 import json
 from logging import getLogger
 import requests
+from requests.adapters import HTTPAdapter
 
 from .message import ExonumMessage
 
 # pylint: disable=C0103
 logger = getLogger(__name__)
 
+_ApiT = TypeVar("_ApiT", bound="Api")
+
 
 class Api:
-    """Api class provides basic REST functionality."""
+    """Api class provides basic REST functionality.
+
+    Requests are sent via a `requests.Session`, so connections to the node are kept alive and reused.
+    A session can be shared between several Api objects (e.g. ExonumClient shares one session between
+    all of its Api objects). If no session is provided, a session shared by the whole process is used.
+
+    Connections can be closed via `close` or by using Api objects as context managers:
+
+    >>> with PublicApi("127.0.0.1", 80, "http") as public_api:
+    >>>     block = public_api.get_block(2).json()
+    """
 
     # constants
     RUST_RUNTIME_ID = 0
+    POOL_CONNECTIONS = 8
+    POOL_MAXSIZE = 32
+
+    # Session which is used if no session is provided, it is created on the first use:
+    _default_session: Optional[requests.Session] = None
 
-    def __init__(self, hostname: str, port: int, schema: str):
+    def __init__(self, hostname: str, port: int, schema: str, session: Optional[requests.Session] = None):
         """
         Constructor of Api.
 
@@ -37,22 +55,61 @@ class Api:
             API port of an Exonum node.
         schema: str
              Communication protocol: 'https' or 'http'.
+        session: Optional[requests.Session]
+            Session to send requests with. If not provided, the default session is used.
         """
         self.schema = schema
         self.hostname = hostname
         self.port = port
         # Example of a formatted prefix: "https://127.0.0.1:8000"
         self.endpoint_prefix = "{}://{}:{}/api".format(self.schema, hostname, port)
+        self._session = session if session is not None else Api.default_session()
+
+    def __enter__(self: _ApiT) -> _ApiT:
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_value: Optional[Any], exc_traceback: Optional[object]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes connections of the session used by the object. The session can still be used after that,
+        but connections will be opened again."""
+        self._session.close()
+
+    @staticmethod
+    def create_session() -> requests.Session:
+        """Creates a session with a connection pool large enough for the requests issued simultaneously
+        (e.g. sources of several services)."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=Api.POOL_CONNECTIONS, pool_maxsize=Api.POOL_MAXSIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def default_session() -> requests.Session:
+        """Returns the session which is used if no session is provided."""
+        if Api._default_session is None:
+            Api._default_session = Api.create_session()
+        return Api._default_session
 
     @staticmethod
-    def get(url: str, params: Optional[Dict[Any, Any]] = None) -> requests.Response:
+    def get(
+        url: str, params: Optional[Dict[Any, Any]] = None, session: Optional[requests.Session] = None
+    ) -> requests.Response:
         """Internal wrapper over requests.get"""
-        return requests.get(url, params=params)
+        if session is None:
+            session = Api.default_session()
+        return session.get(url, params=params)
 
     @staticmethod
-    def post(url: str, data: str, headers: Dict[str, str]) -> requests.Response:
+    def post(
+        url: str, data: str, headers: Dict[str, str], session: Optional[requests.Session] = None
+    ) -> requests.Response:
         """Internal wrapper over requests.post"""
-        return requests.post(url, data=data, headers=headers)
+        if session is None:
+            session = Api.default_session()
+        return session.post(url, data=data, headers=headers)
 
 
 class PublicApi(Api):
@@ -100,7 +157,7 @@ class PublicApi(Api):
             Result of an API call.
             If it is successful, a JSON representation of the block will be in the response.
         """
-        return self.get(self._block_url, params={"height": height})
+        return self.get(self._block_url, params={"height": height}, session=self._session)
 
     # pylint: disable=too-many-arguments
     def get_blocks(
@@ -156,7 +213,7 @@ class PublicApi(Api):
         if add_blocks_time:
             params["add_blocks_time"] = "true"
 
-        return self.get(self._blocks_url, params=params)
+        return self.get(self._blocks_url, params=params, session=self._session)
 
     def get_tx_info(self, tx_hash: str) -> requests.Response:
         """
@@ -204,7 +261,7 @@ class PublicApi(Api):
             Result of an API call.
             If it is successful, a JSON representation of the transaction info will be in the response.
         """
-        return self.get(self._tx_url, params={"hash": tx_hash})
+        return self.get(self._tx_url, params={"hash": tx_hash}, session=self._session)
 
     def available_services(self) -> requests.Response:
         """
@@ -239,7 +296,7 @@ class PublicApi(Api):
           ]
         }
         """
-        return self.get(self._services_url)
+        return self.get(self._services_url, session=self._session)
 
     def get_instance_id_by_name(self, name: str) -> Optional[int]:
         """
@@ -302,7 +359,12 @@ class PublicApi(Api):
             Result of the POST request.
             If a transaction is correct and it is accepted, it will contain a JSON with a hash of the transaction.
         """
-        response = self.post(self._tx_url, data=message.pack_into_json(), headers={"content-type": "application/json"})
+        response = self.post(
+            self._tx_url,
+            data=message.pack_into_json(),
+            headers={"content-type": "application/json"},
+            session=self._session,
+        )
         return response
 
     def send_transactions(self, messages: Iterable[ExonumMessage]) -> List[requests.Response]:
@@ -345,7 +407,12 @@ class PrivateApi(Api):
             Result of an API call.
         """
         data = json.dumps({"address": address, "public_key": public_key})
-        response = self.post(self._system_url.format("peers"), data=data, headers={"content-type": "application/json"})
+        response = self.post(
+            self._system_url.format("peers"),
+            data=data,
+            headers={"content-type": "application/json"},
+            session=self._session,
+        )
         return response
 
     def get_info(self) -> requests.Response:
@@ -392,7 +459,7 @@ class PrivateApi(Api):
             Result of an API call.
             If it is successful, a list of peers will be returned.
         """
-        return self.get(self._system_url.format("info"))
+        return self.get(self._system_url.format("info"), session=self._session)
 
     def set_consensus_interaction(self, enabled: bool = True) -> requests.Response:
         """
@@ -410,7 +477,10 @@ class PrivateApi(Api):
         """
         data = json.dumps({"enabled": enabled})
         return self.post(
-            self._system_url.format("consensus_status"), data=data, headers={"content-type": "application/json"}
+            self._system_url.format("consensus_status"),
+            data=data,
+            headers={"content-type": "application/json"},
+            session=self._session,
         )
 
     def get_stats(self) -> requests.Response:
@@ -441,7 +511,7 @@ class PrivateApi(Api):
         response: requests.Response
             Result of an API call.
         """
-        return self.get(self._system_url.format("stats"))
+        return self.get(self._system_url.format("stats"), session=self._session)
 
     def shutdown(self) -> requests.Response:
         """
@@ -455,7 +525,12 @@ class PrivateApi(Api):
             Result of an API call.
         """
         data = json.dumps(None)
-        return self.post(self._system_url.format("shutdown"), data=data, headers={"content-type": "application/json"})
+        return self.post(
+            self._system_url.format("shutdown"),
+            data=data,
+            headers={"content-type": "application/json"},
+            session=self._session,
+        )
 
 
 class ServiceApi(Api):
@@ -511,7 +586,7 @@ class ServiceApi(Api):
         response: requests.Response
             Result of an API call.
         """
-        return self.get(self.service_endpoint(sub_uri))
+        return self.get(self.service_endpoint(sub_uri), session=self._session)
 
     def post_service(self, sub_uri: str, data: Any, data_format: str = "json") -> requests.Response:
         """
@@ -532,4 +607,4 @@ class ServiceApi(Api):
         else:
             headers = {"content-type": "application/octet-stream"}
 
-        return self.post(self.service_endpoint(sub_uri), data=data, headers=headers)
+        return self.post(self.service_endpoint(sub_uri), data=data, headers=headers, session=self._session)
@@ -13,7 +13,7 @@ from threading import Thread
 from urllib.parse import urlencode
 from websocket import WebSocket
 
-from .api import ServiceApi, PublicApi, PrivateApi
+from .api import Api, ServiceApi, PublicApi, PrivateApi
 from .protobuf_loader import ProtobufLoader
 from .message import ExonumMessage
 from .protobuf_provider import ProtobufProvider, ExonumApiProvider
@@ -106,7 +106,7 @@ class Subscriber:
     def wait_for_new_event(self) -> None:
         """ Waits until a new event (block or transaction) is ready. Please note that this method is a blocking one. """
         if self._is_running:
-            print("Subscriber is already running...")
+            logger.warning("Subscriber is already running, event is not awaited.")
         else:
             self._ws_client.recv()
 
@@ -154,6 +154,7 @@ class Subscriber:
         return response
 
 
+# pylint: disable=too-many-instance-attributes
 class ExonumClient:
     """ExonumClient class is capable of interaction with ExonumBlockchain.
 
@@ -177,6 +178,12 @@ class ExonumClient:
     >>> user_agent = client.public_api.user_agent().json()
     exonum 1.0.0/rustc 1.42.0 (eae3437df 2019-08-13)
 
+    All the Api objects of the client share one `requests.Session`, so connections to the node are reused.
+    These connections are closed via `close` or on exit if the client is used as a context manager:
+
+    >>> with ExonumClient(hostname="127.0.0.1", public_api_port=8080, private_api_port=8081) as client:
+    >>>     block = client.public_api.get_block(2).json()
+
     # Websocket interaction
 
     To interact with the Exonum node via webscokets, one should create a Subscriber object.
@@ -244,12 +251,15 @@ class ExonumClient:
         self.public_api_port = public_api_port
         self.private_api_port = private_api_port
 
-        self.public_api = PublicApi(hostname, public_api_port, self.schema)
-        self.private_api = PrivateApi(hostname, private_api_port, self.schema)
+        # Session is shared by all the Api objects of the client:
+        self._session = Api.create_session()
+
+        self.public_api = PublicApi(hostname, public_api_port, self.schema, session=self._session)
+        self.private_api = PrivateApi(hostname, private_api_port, self.schema, session=self._session)
 
         # Initialize protobuf provider.
         rust_runtime_id = 0
-        exonum_api_protobuf_provider = ExonumApiProvider(hostname, public_api_port, self.schema)
+        exonum_api_protobuf_provider = ExonumApiProvider(hostname, public_api_port, self.schema, session=self._session)
         self.protobuf_provider = ProtobufProvider()
         self.protobuf_provider.add_fallback_provider(rust_runtime_id, exonum_api_protobuf_provider)
 
@@ -264,6 +274,17 @@ class ExonumClient:
 
         return json.dumps(d, indent=2)
 
+    def __enter__(self) -> "ExonumClient":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_value: Optional[Any], exc_traceback: Optional[object]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes connections to the node. The client can still be used after that, but connections
+        will be opened again."""
+        self._session.close()
+
     def service_private_api(self, service_name: str) -> ServiceApi:
         """Creates an instances of ServiceApi to interact with private API of a service.
 
@@ -277,7 +298,7 @@ class ExonumClient:
         service_api: ServiceApi
             An instance of ServiceApi for private API.
         """
-        return ServiceApi(service_name, self.hostname, self.private_api_port, self.schema)
+        return ServiceApi(service_name, self.hostname, self.private_api_port, self.schema, session=self._session)
 
     def service_public_api(self, service_name: str) -> ServiceApi:
         """Creates an instances of ServiceApi to interact with public API of a service.
@@ -292,7 +313,7 @@ class ExonumClient:
         service_api: ServiceApi
             An instance of ServiceApi for public API.
         """
-        return ServiceApi(service_name, self.hostname, self.public_api_port, self.schema)
+        return ServiceApi(service_name, self.hostname, self.public_api_port, self.schema, session=self._session)
 
     def service_apis(self, service_name: str) -> Tuple[ServiceApi, ServiceApi]:
         """Creates a tuple of ServiceApi instances to interact with public and private API of a service.
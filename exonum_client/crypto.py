@@ -29,6 +29,10 @@ _SIGNATURE_BYTES_LEN = crypto_sign_BYTES
 class _FixedByteArray:
     """Base class for types which store a bytes sequence of a fixed length."""
 
+    # Objects of these types (hashes especially) are created in large amounts, e.g. for every node of a proof,
+    # so the only attribute is stored in a slot instead of the instance dictionary:
+    __slots__ = ("value",)
+
     def __init__(self, data: bytes, expected_len: int):
         if len(data) != expected_len:
             raise ValueError(f"Incorrect data length: expected {expected_len}, got {len(data)}.")
@@ -51,6 +55,8 @@ class _FixedByteArray:
 class Hash(_FixedByteArray):
     """Representation of a SHA-256 hash."""
 
+    __slots__ = ()
+
     def __init__(self, hash_bytes: bytes):
         super().__init__(hash_bytes, _HASH_BYTES_LEN)
 
@@ -69,6 +75,8 @@ class Hash(_FixedByteArray):
 class PublicKey(_FixedByteArray):
     """Representation of a Ed25519 Public Key."""
 
+    __slots__ = ()
+
     def __init__(self, key: bytes):
         super().__init__(key, _PUBLIC_KEY_BYTES_LEN)
 
@@ -76,6 +84,8 @@ class PublicKey(_FixedByteArray):
 class SecretKey(_FixedByteArray):
     """Representation of a Ed25519 Secret Key."""
 
+    __slots__ = ()
+
     def __init__(self, key: bytes):
         super().__init__(key, _SECRET_KEY_BYTES_LEN)
 
@@ -104,6 +114,8 @@ class KeyPair:
 class Signature(_FixedByteArray):
     """Representation of a Ed25519 signature"""
 
+    __slots__ = ()
+
     def __init__(self, signature: bytes):
         super().__init__(signature, _SIGNATURE_BYTES_LEN)
 
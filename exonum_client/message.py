@@ -74,11 +74,11 @@ class MessageGenerator:
     def pk_to_hash_address(public_key: PublicKey) -> Optional[Hash]:
         """Converts `PublicKey` into a `Hash`, which is a uniform
         presentation of any transaction authorization supported by Exonum."""
-        types_module = ModuleManager.import_main_module("exonum.crypto.types")
         auth_module = ModuleManager.import_main_module("exonum.runtime.auth")
 
+        # Key is set in place instead of copying a separately created PublicKey message:
         caller = auth_module.Caller()
-        caller.transaction_author.CopyFrom(types_module.PublicKey(data=public_key.value))
+        caller.transaction_author.data = public_key.value
         hash_address = Hash.hash_data(caller.SerializeToString())
         return hash_address
 
@@ -212,15 +212,15 @@ class ExonumMessage:
         self._author = public_key
 
         messages_mod = ModuleManager.import_main_module("exonum.messages")
-        types_mod = ModuleManager.import_main_module("exonum.crypto.types")
 
+        # Author and signature are set in place instead of copying separately created messages:
         signed_message = messages_mod.SignedMessage()
         signed_message.payload = self._any_tx_raw
-        signed_message.author.CopyFrom(types_mod.PublicKey(data=public_key.value))
+        signed_message.author.data = public_key.value
 
         signature = Signature.sign(signed_message.payload, secret_key)
 
-        signed_message.signature.CopyFrom(types_mod.Signature(data=signature.value))
+        signed_message.signature.data = signature.value
 
         self._signature = signature
 
@@ -1,7 +1,8 @@
 """Module capable of loading the Protobuf-generated modules."""
 from typing import Any
 import importlib
-import re
+
+from .protobuf_loader import _artifact_module_name
 
 
 class ModuleManager:
@@ -31,8 +32,7 @@ class ModuleManager:
     @staticmethod
     def import_service_module(artifact_name: str, artifact_version: str, module_name: str) -> Any:
         """Imports the service (corresponding to some artifact) module."""
-        artifact_full_name = f"{artifact_name}:{artifact_version}"
-        artifact_module_name = re.sub(r"[-. :/]", "_", artifact_full_name)
+        artifact_module_name = _artifact_module_name(artifact_name, artifact_version)
         module = importlib.import_module("exonum_modules.{}.{}_pb2".format(artifact_module_name, module_name))
 
         return module
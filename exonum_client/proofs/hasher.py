@@ -1,8 +1,8 @@
 """Module with Hashing Utils for Proofs."""
 from enum import IntEnum
+from hashlib import sha256
 import struct
 
-# From pysodium import crypto_hash_sha256, crypto_hash_sha256_BYTES
 from exonum_client.crypto import Hash
 
 # Default hash value for empty ProofMapIndex.
@@ -24,35 +24,53 @@ class Hasher:
         MAP_NODE = 3
         MAP_BRANCH_NODE = 4
 
+    # Hashing is performed for every node of the proof, so tags are serialized once:
+    _LIST_BRANCH_NODE_TAG = struct.pack("<B", HashTag.LIST_BRANCH_NODE)
+    _BLOB_TAG = struct.pack("<B", HashTag.BLOB)
+    _MAP_NODE_TAG = struct.pack("<B", HashTag.MAP_NODE)
+    _MAP_BRANCH_NODE_TAG = struct.pack("<B", HashTag.MAP_BRANCH_NODE)
+    # List node (tag, length and the root hash) is packed at once with a precompiled format:
+    _LIST_NODE_STRUCT = struct.Struct(f"<BQ{HASH_SIZE}s")
+
+    @staticmethod
+    def _hash(data: bytes) -> Hash:
+        # SHA-256 from the standard library produces the same result as the libsodium one used by
+        # `Hash.hash_data`, but is called without the FFI overhead.
+        # Digest always has the length of the hash, so the constructor (length check and copy of the value)
+        # is skipped:
+        hash_value = Hash.__new__(Hash)
+        hash_value.value = sha256(data).digest()
+        return hash_value
+
     @staticmethod
     def hash_raw_data(data: bytes) -> Hash:
         """ SHA256 hash of the provided data. """
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_node(left: Hash, right: Hash) -> Hash:
         """ Convenience method to obtain a hashed value of the merkle tree node. """
 
-        data = struct.pack("<B", Hasher.HashTag.LIST_BRANCH_NODE) + left.value + right.value
+        data = Hasher._LIST_BRANCH_NODE_TAG + left.value + right.value
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_single_node(left: Hash) -> Hash:
         """ Convenience method to obtain a hashed value of the merkle tree node with one child. """
 
-        data = struct.pack("<B", Hasher.HashTag.LIST_BRANCH_NODE) + left.value
+        data = Hasher._LIST_BRANCH_NODE_TAG + left.value
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_leaf(val: bytes) -> Hash:
         """ Convenience method to obtain a hashed value of the merkle tree leaf. """
 
-        data = struct.pack("<B", Hasher.HashTag.BLOB) + val
+        data = Hasher._BLOB_TAG + val
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_list_node(length: int, merkle_root: Hash) -> Hash:
@@ -62,9 +80,9 @@ class Hasher:
         h = sha-256( HashTag::ListNode || len as u64 || merkle_root )
         ```
         """
-        data = struct.pack("<BQ", Hasher.HashTag.LIST_NODE, length) + merkle_root.value
+        data = Hasher._LIST_NODE_STRUCT.pack(Hasher.HashTag.LIST_NODE, length, merkle_root.value)
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_map_node(root: Hash) -> Hash:
@@ -74,9 +92,9 @@ class Hasher:
         h = sha-256( HashTag::MapNode || merkle_root )
         ```
         """
-        data = struct.pack("<B", Hasher.HashTag.MAP_NODE) + root.value
+        data = Hasher._MAP_NODE_TAG + root.value
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_map_branch(branch_node: bytes) -> Hash:
@@ -86,9 +104,21 @@ class Hasher:
         h = sha-256( HashTag::MapBranchNode || <left_key> || <right_key> || <left_hash> || <right_hash> )
         ```
         """
-        data = struct.pack("<B", Hasher.HashTag.MAP_BRANCH_NODE) + branch_node
+        data = Hasher._MAP_BRANCH_NODE_TAG + branch_node
+
+        return Hasher._hash(data)
+
+    @staticmethod
+    def hash_map_branch_children(left_hash: Hash, right_hash: Hash, left_path: bytes, right_path: bytes) -> Hash:
+        """
+        Hash of the map branch node built directly from its children.
+        Paths are expected to be compressed (see `ProofPath.as_bytes_compressed`).
+        Result is the same as for `hash_map_branch` called with the serialized branch node.
+        """
+        # Parts are joined at once, without the intermediate concatenation results:
+        data = b"".join((Hasher._MAP_BRANCH_NODE_TAG, left_hash.value, right_hash.value, left_path, right_path))
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
 
     @staticmethod
     def hash_single_entry_map(path: bytes, child_hash: Hash) -> Hash:
@@ -98,6 +128,6 @@ class Hasher:
         h = sha-256( HashTag::MapBranchNode || <key> || <child_hash> )
         ```
         """
-        data = struct.pack("<B", Hasher.HashTag.MAP_BRANCH_NODE) + path + child_hash.value
+        data = Hasher._MAP_BRANCH_NODE_TAG + path + child_hash.value
 
-        return Hash.hash_data(data)
+        return Hasher._hash(data)
@@ -32,6 +32,7 @@ class HashedEntry:
             raise err
 
         key = ProofListKey.parse(data)
+        # Hash is already checked with `is_field_hash`, so it is converted right away:
         return HashedEntry(key, Hash(bytes.fromhex(data["hash"])))
 
     def __eq__(self, other: object) -> bool:
@@ -17,7 +17,8 @@ class BranchNode:
     BRANCH_NODE_SIZE = 2 * (Hasher.HASH_SIZE + PROOF_PATH_SIZE)
 
     def __init__(self) -> None:
-        self.raw = bytearray([0] * self.BRANCH_NODE_SIZE)
+        # Node size is known in advance, so the zeroed buffer is allocated at once:
+        self.raw = bytearray(self.BRANCH_NODE_SIZE)
 
     @staticmethod
     def _verify_kind(kind: str) -> None:
@@ -47,7 +48,8 @@ class BranchNode:
 
     def set_child_path(self, kind: str, prefix: ProofPath) -> None:
         """Sets a child path for the specified kind ("left" or "right")."""
-        self.raw[self._path_slice(kind)] = prefix.as_bytes()
+        # Path data is copied into the node directly, without creating an intermediate bytes object:
+        self.raw[self._path_slice(kind)] = prefix.data_bytes
 
     def set_child_hash(self, kind: str, child_hash: Hash) -> None:
         """Sets a child hash for the specified kind ("left" or "right")."""
@@ -60,15 +62,11 @@ class BranchNode:
 
     def object_hash(self) -> Hash:
         """Returns a hash of the branch node."""
-        data = bytearray()
-
-        data += self.raw[self._hash_slice("left")]
-        data += self.raw[self._hash_slice("right")]
+        # Both child hashes are stored contiguously at the beginning of the raw data,
+        # so they are hashed as is, without creating Hash objects:
+        hashes = self.raw[0 : 2 * Hasher.HASH_SIZE]
 
         left_path_compressed = self.child_path("left").as_bytes_compressed()
-        data += left_path_compressed
-
         right_path_compressed = self.child_path("right").as_bytes_compressed()
-        data += right_path_compressed
 
-        return Hasher.hash_map_branch(data)
+        return Hasher.hash_map_branch(b"".join((hashes, left_path_compressed, right_path_compressed)))
@@ -1,5 +1,6 @@
 """Common Errors for the MapProof Module."""
-from typing import Dict, Any
+
+from typing import Dict, Any, Callable, Optional, Tuple
 from enum import Enum, auto as enum_auto
 
 from .constants import KEY_SIZE
@@ -9,7 +10,10 @@ from .constants import KEY_SIZE
 
 
 class MalformedMapProofError(Exception):
-    """Error to be raised if the provided proof is malformed."""
+    """Error to be raised if the provided proof is malformed.
+
+    Errors created by the factory methods build the message from `error_data` when the error
+    is converted to a string (or represented, or pickled), `args` contains `None` until then."""
 
     class ErrorKind(Enum):
         """Kind of the error."""
@@ -21,55 +25,71 @@ class MalformedMapProofError(Exception):
         MALFORMED_ENTRY = enum_auto()
         INVALID_KEY_SIZE = enum_auto()
 
-    def __init__(self, message: str, error_data: Dict[str, Any]) -> None:
+    # Builders of the error messages for each error kind:
+    _MESSAGE_BUILDERS: Dict[ErrorKind, Callable[[Dict[str, Any]], str]] = {
+        ErrorKind.EMBEDDED_PATH: lambda data: "Embedded path: prefix {}, path {}".format(data["prefix"], data["path"]),
+        ErrorKind.DUPLICATE_PATH: lambda data: "Duplicate path: path {}".format(data["path"]),
+        ErrorKind.INVALID_ORDERING: lambda data: "Invalid ordering: prev_path {}, path {}".format(
+            data["prev_path"], data["path"]
+        ),
+        ErrorKind.NON_TERMINAL_NODE: lambda data: "Non-terminal node: node {}".format(data["node"]),
+        ErrorKind.MALFORMED_ENTRY: lambda data: "Malformed proof entry: entry {}".format(data["entry"]),
+        ErrorKind.INVALID_KEY_SIZE: lambda data: (
+            f"Invalid key '{data['key']!r}' for raw MapProof, expected size {KEY_SIZE}, actual {len(data['key'])}"
+        ),
+    }
+
+    def __init__(self, message: Optional[str], error_data: Dict[str, Any]) -> None:
         super().__init__(message)
 
         self.error_data = error_data
+        self._additional_info: Any = None
+
+    def __str__(self) -> str:
+        error_msg = self.args[0]
+        if error_msg is None:
+            error_msg = self._MESSAGE_BUILDERS[self.error_data["kind"]](self.error_data)
+            if self._additional_info:
+                error_msg += " [{}]".format(self._additional_info)
+
+            # Message is built only once:
+            self.args = (error_msg,)
+
+        return error_msg
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(type(self).__name__, str(self))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Message is built before pickling, so the restored error does not need the additional info:
+        return type(self), (str(self), self.error_data)
 
     @classmethod
     def embedded_paths(cls, prefix: Any, path: Any) -> "MalformedMapProofError":
-        error_msg = "Embedded path: prefix {}, path {}".format(prefix, path)
-        error_data = {"kind": cls.ErrorKind.EMBEDDED_PATH, "prefix": prefix, "path": path}
-
-        return cls(error_msg, error_data)
+        return cls(None, {"kind": cls.ErrorKind.EMBEDDED_PATH, "prefix": prefix, "path": path})
 
     @classmethod
     def duplicate_path(cls, path: Any) -> "MalformedMapProofError":
-        error_msg = "Duplicate path: path {}".format(path)
-        error_data = {"kind": cls.ErrorKind.DUPLICATE_PATH, "path": path}
-
-        return cls(error_msg, error_data)
+        return cls(None, {"kind": cls.ErrorKind.DUPLICATE_PATH, "path": path})
 
     @classmethod
     def invalid_ordering(cls, path_a: Any, path_b: Any) -> "MalformedMapProofError":
-        error_msg = "Invalid ordering: prev_path {}, path {}".format(path_a, path_b)
-        error_data = {"kind": cls.ErrorKind.INVALID_ORDERING, "prev_path": path_a, "path": path_b}
-
-        return cls(error_msg, error_data)
+        return cls(None, {"kind": cls.ErrorKind.INVALID_ORDERING, "prev_path": path_a, "path": path_b})
 
     @classmethod
     def non_terminal_node(cls, node: Any) -> "MalformedMapProofError":
-        error_msg = "Non-terminal node: node {}".format(node)
-        error_data = {"kind": cls.ErrorKind.NON_TERMINAL_NODE, "node": node}
-
-        return cls(error_msg, error_data)
+        return cls(None, {"kind": cls.ErrorKind.NON_TERMINAL_NODE, "node": node})
 
     @classmethod
     def malformed_entry(cls, entry: Any, additional_info: Any = None) -> "MalformedMapProofError":
-        error_msg = "Malformed proof entry: entry {}".format(entry)
-        if additional_info:
-            error_msg += " [{}]".format(additional_info)
-        error_data = {"kind": cls.ErrorKind.MALFORMED_ENTRY, "entry": entry}
+        error = cls(None, {"kind": cls.ErrorKind.MALFORMED_ENTRY, "entry": entry})
+        error._additional_info = additional_info
 
-        return cls(error_msg, error_data)
+        return error
 
     @classmethod
     def invalid_key_size(cls, key: bytes) -> "MalformedMapProofError":
-        error_msg = f"Invalid key '{key!r}' for raw MapProof, expected size {KEY_SIZE}, actual {len(key)}"
-
-        error_data = {"kind": cls.ErrorKind.INVALID_KEY_SIZE, "key": key}
-
-        return cls(error_msg, error_data)
+        return cls(None, {"kind": cls.ErrorKind.INVALID_KEY_SIZE, "key": key})
 
 
 class MapProofBuilderError(Exception):
@@ -1,15 +1,15 @@
 """MapProof Module."""
-from typing import Optional, Dict, Any, List, Iterator, Callable
+from typing import Dict, Any, List, Iterator, Callable
 from logging import getLogger
+import heapq
 
 from exonum_client.crypto import Hash
 from .constants import KEY_SIZE
 from .proof_path import ProofPath
 from .errors import MalformedMapProofError
 from .optional_entry import OptionalEntry
-from .branch_node import BranchNode
 from ..hasher import Hasher
-from ..utils import is_field_hash, to_bytes
+from ..utils import is_field_hash
 
 # pylint: disable=C0103
 logger = getLogger(__name__)
@@ -19,6 +19,10 @@ class _MapProofEntry:
     def __init__(self, path: ProofPath, data_hash: Hash):
         self.path = path
         self.hash = data_hash
+        # Key of the path as a number (see `ProofPath.key_int`) and the length of the path
+        # are used for the path comparisons during the proof verification:
+        self.path_int = path.key_int()
+        self.path_len = len(path)
 
     def __repr__(self) -> str:
         return "Entry [path: {}, hash: {}]".format(self.path, self.hash)
@@ -29,20 +33,55 @@ class _MapProofEntry:
 
         if not isinstance(data.get("path"), str) or not is_field_hash(data, "hash"):
             err = MalformedMapProofError.malformed_entry(data)
-            logger.warning(str(err))
+            logger.warning("%s", err)
             raise err
 
         path_bits = data["path"]
         path = ProofPath.parse(path_bits)
 
-        data_hash = to_bytes(data["hash"])
-        if data_hash is None:
-            err = MalformedMapProofError.malformed_entry(data)
-            logger.warning(str(err))
-            raise err
+        data_hash = bytes.fromhex(data["hash"])
 
         return _MapProofEntry(path, Hash(data_hash))
 
+    @staticmethod
+    def parse_many(data: List[Dict[str, str]]) -> List["_MapProofEntry"]:
+        """ Parses a list of MapProofEntry from the provided list of dicts. """
+
+        # Validate and convert all the hashes at once:
+        try:
+            raw_paths = [raw_entry["path"] for raw_entry in data]
+            raw_hashes = [raw_entry["hash"] for raw_entry in data]
+            hashes = [bytes.fromhex(raw_hash) for raw_hash in raw_hashes]
+            # Hex string of the correct length is converted to a hash of the correct length
+            # only if it does not contain anything except hex digits:
+            is_valid = all(isinstance(raw_path, str) for raw_path in raw_paths) and all(
+                len(raw_hash) == 2 * Hasher.HASH_SIZE and len(data_hash) == Hasher.HASH_SIZE
+                for raw_hash, data_hash in zip(raw_hashes, hashes)
+            )
+        except (KeyError, TypeError, ValueError):
+            is_valid = False
+
+        if not is_valid:
+            # Parse entries one by one to find and report the malformed one:
+            return [_MapProofEntry.parse(raw_entry) for raw_entry in data]
+
+        return [
+            _MapProofEntry(ProofPath.parse(raw_path), Hash(data_hash)) for raw_path, data_hash in zip(raw_paths, hashes)
+        ]
+
+
+def _common_prefix_len(left_int: int, left_len: int, right_int: int, right_len: int) -> int:
+    """ Returns the length of the common prefix for two paths starting at 0, given as key numbers and lengths. """
+    len_to_the_end = min(left_len, right_len)
+
+    # Bits that differ in both keys are set in the XOR of the keys:
+    diff = left_int ^ right_int
+    if diff == 0:
+        return len_to_the_end
+
+    # Position of the lowest set bit is the position of the first mismatch:
+    return min((diff & -diff).bit_length() - 1, len_to_the_end)
+
 
 def collect(entries: List[_MapProofEntry]) -> Hash:
     """
@@ -58,71 +97,70 @@ def collect(entries: List[_MapProofEntry]) -> Hash:
     `entries` are assumed to be sorted by the path in the increasing order.
     """
 
-    def common_prefix(left: ProofPath, right: ProofPath) -> ProofPath:
-        return left.prefix(left.common_prefix_len(right))
-
-    def hash_branch(left_child: _MapProofEntry, right_child: _MapProofEntry) -> Hash:
-        branch = BranchNode()
-        branch.set_child("left", left_child.path, left_child.hash)
-        branch.set_child("right", right_child.path, right_child.hash)
-
-        return branch.object_hash()
-
-    def fold(contour: List[_MapProofEntry], last_prefix: ProofPath) -> Optional[ProofPath]:
-        last_entry = contour.pop()
-        penultimate_entry = contour.pop()
-
-        contour.append(_MapProofEntry(path=last_prefix, data_hash=hash_branch(penultimate_entry, last_entry)))
-
-        if len(contour) > 1:
-            penultimate_entry = contour[len(contour) - 2]
-            return common_prefix(penultimate_entry.path, last_prefix)
-
-        return None
-
     if not entries:
         return Hash(Hasher.DEFAULT_HASH)
 
     if len(entries) == 1:
         if not entries[0].path.is_leaf():
             err = MalformedMapProofError.non_terminal_node(entries[0].path)
-            logger.warning(str(err))
+            logger.warning("%s", err)
             raise err
 
         return Hasher.hash_single_entry_map(entries[0].path.as_bytes_compressed(), entries[0].hash)
 
     # There is more than 1 entry.
 
-    # Contour of entries to be folded into the result hash:
-    contour: List[_MapProofEntry] = []
+    # Contour is stored as a structure of arrays: keys (as numbers), lengths of the paths and hashes of
+    # the contour nodes are kept in separate preallocated stacks (contour never contains more nodes than
+    # there are entries). Prefix of a path is represented by the key of the path and the prefix length.
+    keys = [entry.path_int for entry in entries]
+    lens = [entry.path_len for entry in entries]
+    hashes = [entry.hash for entry in entries]
+
+    def fold(top: int, prefix_int: int, prefix_len: int) -> int:
+        # Replaces two latest nodes of the contour with their parent and returns a new index of the top node.
+        # Equivalent to `BranchNode.object_hash`, but without building the branch node:
+        branch_hash = Hasher.hash_map_branch_children(
+            hashes[top - 1],
+            hashes[top],
+            ProofPath.compress(keys[top - 1], lens[top - 1]),
+            ProofPath.compress(keys[top], lens[top]),
+        )
+
+        top -= 1
+        keys[top], lens[top], hashes[top] = prefix_int, prefix_len, branch_hash
+
+        return top
 
-    # Initical contour state:
-    first_entry, second_entry = entries[0], entries[1]
-    last_prefix = common_prefix(first_entry.path, second_entry.path)
-    contour = [first_entry, second_entry]
+    # Initical contour state, `top` is the index of the latest added node:
+    last_prefix_int, last_prefix_len = keys[0], _common_prefix_len(keys[0], lens[0], keys[1], lens[1])
+    top = 1
 
     # Process the rest of the entries:
-    for entry in entries[2:]:
-        new_prefix = common_prefix(contour[-1].path, entry.path)
+    for idx in range(2, len(entries)):
+        new_prefix_int, new_prefix_len = keys[top], _common_prefix_len(keys[top], lens[top], keys[idx], lens[idx])
 
-        # Fold contour from the latest added entry to the beginning.
-        # At each iteration take two latest entries and attempt to fold them into one new entry:
-        while len(contour) > 1 and len(new_prefix) < len(last_prefix):
-            prefix = fold(contour, last_prefix)
-            if prefix is not None:
-                last_prefix = prefix
+        # Fold contour from the latest added node to the beginning.
+        # At each iteration take two latest nodes and attempt to fold them into one new node:
+        while top > 0 and new_prefix_len < last_prefix_len:
+            top = fold(top, last_prefix_int, last_prefix_len)
+            if top > 0:
+                last_prefix_len = _common_prefix_len(keys[top - 1], lens[top - 1], last_prefix_int, last_prefix_len)
+                last_prefix_int = keys[top - 1]
 
-        contour.append(entry)
-        last_prefix = new_prefix
+        top += 1
+        keys[top], lens[top], hashes[top] = keys[idx], lens[idx], hashes[idx]
+        last_prefix_int, last_prefix_len = new_prefix_int, new_prefix_len
 
     # All entries are processed. Fold the contour into the final hash:
-    while len(contour) > 1:
-        prefix = fold(contour, last_prefix)
-        if prefix:
-            last_prefix = prefix
+    while top > 0:
+        top = fold(top, last_prefix_int, last_prefix_len)
+        if top > 0:
+            last_prefix_len = _common_prefix_len(keys[top - 1], lens[top - 1], last_prefix_int, last_prefix_len)
+            last_prefix_int = keys[top - 1]
 
     logger.debug("Successfully computed the root hash of the Merkle Patricia tree.")
-    return contour[0].hash
+    return hashes[0]
 
 
 class CheckedMapProof:
@@ -130,15 +168,17 @@ class CheckedMapProof:
 
     def __init__(self, entries: List[OptionalEntry], root_hash: Hash):
         self._entries = entries
+        self._missing_entries = [entry for entry in entries if entry.is_missing]
+        self._present_entries = [entry for entry in entries if not entry.is_missing]
         self._root_hash = root_hash
 
     def missing_keys(self) -> Iterator[OptionalEntry]:
         """ Retrieves entries that the proof shows as missing from the map. """
-        return filter(lambda el: el.is_missing, self._entries)
+        return iter(self._missing_entries)
 
     def entries(self) -> Iterator[OptionalEntry]:
         """ Retrieves entries that the proof shows as present in the map. """
-        return filter(lambda el: not el.is_missing, self._entries)
+        return iter(self._present_entries)
 
     def all_entries(self) -> List[OptionalEntry]:
         """ Retrieves all entries in the proof. """
@@ -267,32 +307,46 @@ class MapProof:
             raise MalformedMapProofError.malformed_entry(data)
 
         entries: List[OptionalEntry] = [OptionalEntry.parse(raw_entry) for raw_entry in data["entries"]]
-        proof: List[_MapProofEntry] = [_MapProofEntry.parse(raw_entry) for raw_entry in data["proof"]]
+        proof: List[_MapProofEntry] = _MapProofEntry.parse_many(data["proof"])
 
         map_proof = MapProof(entries, proof, key_to_bytes, value_to_bytes, raw)
         logger.debug("Successfully built MapProof from the given proof dictionary.")
         return map_proof
 
     @staticmethod
-    def _check_proof(proof: List[_MapProofEntry]) -> None:
-        for idx in range(1, len(proof)):
-            prev_path, path = proof[idx - 1].path, proof[idx].path
-
-            if prev_path < path:
-                if path.starts_with(prev_path):
-                    err = MalformedMapProofError.embedded_paths(prev_path, path)
-                    logger.warning(str(err))
+    def _is_sorted(proof: List[_MapProofEntry]) -> bool:
+        """ Returns True if the proof entries are sorted by the paths in the increasing order. """
+        return all(proof[idx - 1].path <= proof[idx].path for idx in range(1, len(proof)))
+
+    @staticmethod
+    def _merge_and_check(proof_a: List[_MapProofEntry], proof_b: List[_MapProofEntry]) -> List[_MapProofEntry]:
+        """
+        Merges two proofs sorted by the paths into one sorted proof, checking
+        that there are no duplicate or embedded paths in the result.
+        """
+
+        def path_key(entry: _MapProofEntry) -> ProofPath:
+            return entry.path
+
+        proof: List[_MapProofEntry] = []
+        for entry in heapq.merge(proof_a, proof_b, key=path_key):
+            if proof:
+                prev_entry = proof[-1]
+                prev_len = prev_entry.path_len
+
+                # Entries are merged in the sorted order, so the previous path is not greater than the current one,
+                # and the current path starts with the previous one only if the paths are either equal or embedded:
+                if _common_prefix_len(entry.path_int, entry.path_len, prev_entry.path_int, prev_len) == prev_len:
+                    if entry.path_len == prev_len:
+                        err = MalformedMapProofError.duplicate_path(entry.path)
+                    else:
+                        err = MalformedMapProofError.embedded_paths(prev_entry.path, entry.path)
+                    logger.warning("%s", err)
                     raise err
-            elif prev_path == path:
-                err = MalformedMapProofError.duplicate_path(path)
-                logger.warning(str(err))
-                raise err
-            elif prev_path > path:
-                err = MalformedMapProofError.invalid_ordering(prev_path, path)
-                logger.warning(str(err))
-                raise err
-            else:
-                assert False, "Incomparable keys in the proof"
+
+            proof.append(entry)
+
+        return proof
 
     def check(self) -> CheckedMapProof:
         """
@@ -326,15 +380,16 @@ class MapProof:
 
             return _MapProofEntry(path, value_hash)
 
-        proof = self.proof[:]
-
         actual_entries = filter(lambda el: not el.is_missing, self.entries)
-
-        proof += map(kv_to_map_entry, actual_entries)
-
-        proof.sort(key=lambda el: el.path)
-
-        self._check_proof(proof)
+        entries_proof = sorted(map(kv_to_map_entry, actual_entries), key=lambda el: el.path)
+
+        # Proof provided by the node is expected to be sorted already, so it is used as is (without a copy)
+        # if it is. Both sorted sequences are merged and checked in one pass instead of sorting their concatenation:
+        if self._is_sorted(self.proof):
+            proof_sorted = self.proof
+        else:
+            proof_sorted = sorted(self.proof, key=lambda el: el.path)
+        proof = self._merge_and_check(proof_sorted, entries_proof)
 
         result = collect(proof)
 
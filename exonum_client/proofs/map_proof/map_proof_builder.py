@@ -59,7 +59,7 @@ class MapProofBuilder:
                 module = ModuleManager.import_service_module(service_name, service_version, service_module)
             else:
                 err = MapProofBuilderError("Module data not provided")
-                logger.warning(str(err))
+                logger.warning("%s", err)
                 raise err
 
             encoder = getattr(module, structure_name)
@@ -69,13 +69,13 @@ class MapProofBuilder:
             error_data = {"main_module": main_module, "service_name": service_name, "service_module": service_module}
 
             err = MapProofBuilderError("Incorrect module data", error_data)
-            logger.warning("%s: %s", str(err), error_data)
+            logger.warning("%s: %s", err, error_data)
             raise err from e
         except AttributeError as e:
             error_data = {"service_name": structure_name}
 
             err = MapProofBuilderError("Incorrect structure name", error_data)
-            logger.warning("%s: %s", str(err), error_data)
+            logger.warning("%s: %s", err, error_data)
             raise err from e
 
     # pylint: disable=too-many-arguments
@@ -180,7 +180,7 @@ class MapProofBuilder:
         """
         if not self._key_encoder or not self._value_encoder:
             err = MapProofBuilderError("Encoders are not set.")
-            logger.warning(str(err))
+            logger.warning("%s", err)
             raise err
 
         key_encoder_func = build_encoder_function(self._key_encoder)
@@ -1,10 +1,9 @@
 """ProofPath Module."""
 from typing import Optional
-from functools import total_ordering
 from enum import IntEnum
 from logging import getLogger
 
-from ..utils import div_ceil, reset_bits, leb128_encode_unsigned
+from ..utils import div_ceil, leb128_encode_unsigned
 
 from .constants import KEY_SIZE, PROOF_PATH_SIZE
 from .errors import MalformedMapProofError
@@ -12,11 +11,18 @@ from .errors import MalformedMapProofError
 # pylint: disable=C0103
 logger = getLogger(__name__)
 
+# Length of a path never exceeds the amount of bits in the key, so LEB128 encodings
+# of all the possible lengths are computed once:
+_LEB128_LENGTHS = tuple(leb128_encode_unsigned(bits_len) for bits_len in range(8 * KEY_SIZE + 1))
+
 
-@total_ordering
 class ProofPath:
     """ProofPath is a representation of the key in MapProof."""
 
+    # Paths are created for every proof entry and every tree node, so attributes are fixed
+    # to reduce the memory footprint and speed up the attribute access:
+    __slots__ = ("_data_bytes", "_owned", "_is_leaf", "_start", "_len", "_key_int")
+
     class _KeyPrefix(IntEnum):
         BRANCH = 0
         LEAF = 1
@@ -27,6 +33,9 @@ class ProofPath:
         KEY_POS = 1
         LEN_POS = KEY_SIZE + 1
 
+    # Data of a leaf path with an empty key (kind byte, key bytes and zero length):
+    _LEAF_TEMPLATE = bytes([_KeyPrefix.LEAF]) + bytes(PROOF_PATH_SIZE - 1)
+
     @staticmethod
     def parse(bits: str) -> "ProofPath":
         """
@@ -54,19 +63,15 @@ class ProofPath:
             logger.warning(error)
             raise MalformedMapProofError.malformed_entry(bits, error)
 
-        data = [0] * KEY_SIZE
-
-        for i, char in enumerate(bits):
-            if char == "0":
-                pass
-            elif char == "1":
-                data[i // 8] += 1 << (i % 8)
-            else:
-                error = "Unexpected MapProof path symbol: {}".format(char)
-                logger.warning(error)
-                raise MalformedMapProofError.malformed_entry(bits, error)
+        # After stripping valid symbols from both ends, the first remaining symbol (if any) is an unexpected one:
+        unexpected_symbols = bits.strip("01")
+        if unexpected_symbols:
+            error = "Unexpected MapProof path symbol: {}".format(unexpected_symbols[0])
+            logger.warning(error)
+            raise MalformedMapProofError.malformed_entry(bits, error)
 
-        data_bytes = bytes(data)
+        # Bit `i` of the path is the `i`-th bit of the key interpreted as a little-endian number:
+        data_bytes = int(bits[::-1], 2).to_bytes(KEY_SIZE, "little")
 
         proof_path = ProofPath.from_bytes(data_bytes)
         if length != 8 * KEY_SIZE:
@@ -99,40 +104,50 @@ class ProofPath:
             logger.warning("Wrong length of the provided byte sequence: expected %s, got %s", KEY_SIZE, len(data_bytes))
             raise ValueError("Incorrect data size")
 
-        inner = bytearray([0] * PROOF_PATH_SIZE)
-
-        inner[0] = ProofPath._KeyPrefix.LEAF
-        inner[ProofPath._Positions.KEY_POS : ProofPath._Positions.KEY_POS + KEY_SIZE] = data_bytes[:]
-        inner[ProofPath._Positions.LEN_POS] = 0
+        # Kind and length are already set in the template, only the key has to be filled:
+        inner = bytearray(ProofPath._LEAF_TEMPLATE)
+        inner[ProofPath._Positions.KEY_POS : ProofPath._Positions.LEN_POS] = data_bytes
 
         return ProofPath(inner, 0)
 
-    def __init__(self, data_bytes: bytearray, start: int):
-        """ Constructor of ProofPath. Expects arguments to be cleaned already and does not check anything. """
-        self.data_bytes = data_bytes
+    def __init__(self, data_bytes: bytearray, start: int, prefix_len: Optional[int] = None):
+        """
+        Constructor of ProofPath. Expects arguments to be cleaned already and does not check anything.
+
+        If `prefix_len` is provided, the path is a branch of the given length which shares
+        `data_bytes` with another path (see `prefix`). Shared data is copied before it can be modified.
+        """
+        self._data_bytes = data_bytes
+        self._owned = prefix_len is None
         self._start = start
+        # Kind and length of the path are cached, since they are used in almost every operation on paths:
+        if prefix_len is None:
+            self._is_leaf = data_bytes[0] == ProofPath._KeyPrefix.LEAF
+            self._len = self._calculate_end() - start
+        else:
+            self._is_leaf = False
+            self._len = prefix_len
+        # Key interpreted as a little-endian number, calculated on demand (see `key_int`):
+        self._key_int: Optional[int] = None
 
     def __repr__(self) -> str:
         """ Conversion to a string. """
-        bits_str = ""
+        start, end, key = self.start(), self.end(), self.key_int()
+        bits = []
 
-        raw_key = self.raw_key()
-        for byte_idx, chunk in enumerate(raw_key):
+        for byte_idx in range(KEY_SIZE):
             # Range from 7 to 0 inclusively:
             for bit in range(7, -1, -1):
                 i = byte_idx * 8 + bit
-                if i < self.start() or i >= self.end():
-                    bits_str += "_"
-                else:
-                    bits_str += "0" if (1 << bit) & chunk == 0 else "1"
+                bits.append("_" if i < start or i >= end else "01"[(key >> i) & 1])
 
-            bits_str += "|"
+            bits.append("|")
 
-        format_str = "ProofPath [ start: {}, end: {}, bits: {} ]".format(self.start(), self.end(), bits_str)
+        format_str = "ProofPath [ start: {}, end: {}, bits: {} ]".format(start, end, "".join(bits))
         return format_str
 
     def __len__(self) -> int:
-        return self.end() - self.start()
+        return self._len
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, ProofPath):
@@ -141,19 +156,15 @@ class ProofPath:
 
     def bit(self, idx: int) -> int:
         """Returns a bit of the path at the specified position."""
-        pos = self.start() + idx
-        chunk = self.raw_key()[(pos // 8)]
-        bit = pos % 8
-        return ((1 << bit) & chunk) >> bit
+        return (self.key_int() >> (self._start + idx)) & 1
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, ProofPath):
-            raise TypeError("Attempt to compare ProofPath with an object of a different type.")
-
-        if self.start() != other.start():
-            return NotImplemented
-
-        if self.start() != 0:
+    def compare(self, other: "ProofPath") -> int:
+        """
+        Compares paths in the lexicographic order.
+        Returns a negative number if `self` is less than `other`, zero if paths are equal,
+        and a positive number if `self` is greater than `other`.
+        """
+        if self.start() != other.start() or self.start() != 0:
             # The code below does not work if `self.start() % 8 != 0` without additional modifications:
             raise ValueError("Comparison is allowed only for paths with start =0")
 
@@ -165,13 +176,59 @@ class ProofPath:
         pos = self.common_prefix_len(other)
 
         if pos == intersecting_bits:
-            return this_len < other_len
+            return this_len - other_len
+
+        return self.bit(pos) - other.bit(pos)
+
+    def _compare(self, other: object) -> int:
+        if not isinstance(other, ProofPath):
+            raise TypeError("Attempt to compare ProofPath with an object of a different type.")
 
-        return self.bit(pos) < other.bit(pos)
+        return self.compare(other)
+
+    def __lt__(self, other: object) -> bool:
+        return self._compare(other) < 0
+
+    def __le__(self, other: object) -> bool:
+        return self._compare(other) <= 0
+
+    def __gt__(self, other: object) -> bool:
+        return self._compare(other) > 0
+
+    def __ge__(self, other: object) -> bool:
+        return self._compare(other) >= 0
+
+    @property
+    def data_bytes(self) -> bytearray:
+        """
+        Path data in the Merkledb format. Data shared with another path is copied on the first access.
+
+        Returned data may be modified by the caller, so the key cached by `key_int` is reset.
+        """
+        data_bytes = self._own_data_bytes()
+        self._key_int = None
+
+        return data_bytes
+
+    def _own_data_bytes(self) -> bytearray:
+        if not self._owned:
+            data_bytes = bytearray(self._data_bytes)
+            # Only the key is shared, the kind and the length of the path are stored in this object:
+            if self._is_leaf:
+                data_bytes[ProofPath._Positions.KIND_POS] = ProofPath._KeyPrefix.LEAF
+                data_bytes[ProofPath._Positions.LEN_POS] = 0
+            else:
+                data_bytes[ProofPath._Positions.KIND_POS] = ProofPath._KeyPrefix.BRANCH
+                data_bytes[ProofPath._Positions.LEN_POS] = self.end()
+
+            self._data_bytes = data_bytes
+            self._owned = True
+
+        return self._data_bytes
 
     def is_leaf(self) -> bool:
         """ Returns True if ProofPath is a leaf. Otherwise returns False """
-        return self.data_bytes[0] == ProofPath._KeyPrefix.LEAF
+        return self._is_leaf
 
     def start(self) -> int:
         """ Returns the index of the start bit. """
@@ -179,23 +236,40 @@ class ProofPath:
 
     def end(self) -> int:
         """ Returns the index of the end bit. """
-        if self.is_leaf():
+        return self._start + self._len
+
+    def _calculate_end(self) -> int:
+        if self._is_leaf:
             return KEY_SIZE * 8
 
-        return self.data_bytes[ProofPath._Positions.LEN_POS]
+        return self._data_bytes[ProofPath._Positions.LEN_POS]
 
     def raw_key(self) -> bytes:
         """ Returns the stored key as raw bytes. """
-        return bytes(self.data_bytes[ProofPath._Positions.KEY_POS : ProofPath._Positions.KEY_POS + KEY_SIZE])
+        return bytes(self._data_bytes[ProofPath._Positions.KEY_POS : ProofPath._Positions.KEY_POS + KEY_SIZE])
+
+    def key_int(self) -> int:
+        """ Returns the stored key as a little-endian number, so bit `i` of the key is `(key_int >> i) & 1`. """
+        if self._key_int is None:
+            # Key is converted right from the slice of the path data, without copying it into bytes first
+            # (memoryview is not used, since it is slower than copying for the data of this size):
+            key_slice = self._data_bytes[ProofPath._Positions.KEY_POS : ProofPath._Positions.KEY_POS + KEY_SIZE]
+            self._key_int = int.from_bytes(key_slice, "little")
+
+        return self._key_int
 
     def set_end(self, end: Optional[int]) -> None:
         """ Sets the right border of the proof path. """
+        data_bytes = self._own_data_bytes()
         if end is not None:
-            self.data_bytes[0] = self._KeyPrefix.BRANCH
-            self.data_bytes[self._Positions.LEN_POS] = end
+            data_bytes[0] = self._KeyPrefix.BRANCH
+            data_bytes[self._Positions.LEN_POS] = end
         else:
-            self.data_bytes[0] = self._KeyPrefix.LEAF
-            self.data_bytes[self._Positions.LEN_POS] = 0
+            data_bytes[0] = self._KeyPrefix.LEAF
+            data_bytes[self._Positions.LEN_POS] = 0
+
+        self._is_leaf = end is None
+        self._len = self._calculate_end() - self._start
 
     def prefix(self, length: int) -> "ProofPath":
         """ Creates a copy of this path shortened to the specified length. """
@@ -208,10 +282,11 @@ class ProofPath:
             logger.warning(err_msg)
             raise ValueError(err_msg)
 
-        key = ProofPath(bytearray(self.data_bytes), self._start)
-        key.set_end(end)
+        # Prefix shares the key with this path, its own data is only created if it is needed.
+        # Data becomes shared, so this path copies it too before the data can be modified:
+        self._owned = False
 
-        return key
+        return ProofPath(self._data_bytes, self._start, length)
 
     def match_len(self, other: "ProofPath", from_bit: int) -> int:
         """ Returns the length of the common segment. """
@@ -225,11 +300,16 @@ class ProofPath:
             raise ValueError(err_msg)
 
         len_to_the_end = min(len(self), len(other))
-        for i in range(from_bit, len_to_the_end):
-            if self.bit(i) != other.bit(i):
-                return i
 
-        return len_to_the_end
+        # Bits that differ in both keys are set in the XOR of the keys:
+        diff = (self.key_int() ^ other.key_int()) >> (self.start() + from_bit)
+        if diff == 0:
+            return len_to_the_end
+
+        # Position of the lowest set bit is the position of the first mismatch:
+        first_mismatch = from_bit + (diff & -diff).bit_length() - 1
+
+        return min(first_mismatch, len_to_the_end)
 
     def common_prefix_len(self, other: "ProofPath") -> int:
         """ Returns the length of the common prefix. """
@@ -245,23 +325,21 @@ class ProofPath:
     def as_bytes(self) -> bytes:
         """ Represents a path as bytes according to the Merkledb implementation. """
 
-        return bytes(self.data_bytes)
+        return bytes(self._own_data_bytes())
 
     def as_bytes_compressed(self) -> bytes:
         """ Represents a path as compressed bytes using les128 algorigthm. """
-        bits_len = self.end()
-        whole_bytes_len = div_ceil(bits_len, 8)
-
-        key = self.raw_key()[0:whole_bytes_len]
+        return ProofPath.compress(self.key_int(), self.end())
 
-        result = bytearray()
-        result += leb128_encode_unsigned(bits_len)
-        result += key
+    @staticmethod
+    def compress(key_int: int, bits_len: int) -> bytes:
+        """
+        Represents a path given as a key number (see `key_int`) and the end bit
+        as compressed bytes using les128 algorigthm.
+        """
+        whole_bytes_len = div_ceil(bits_len, 8)
 
-        # Trim insignificant bits in the last byte:
-        bits_in_last_byte = bits_len % 8
-        if whole_bytes_len > 0 and bits_in_last_byte != 0:
-            tail = self.end() % 8
-            result[-1] = reset_bits(result[-1], tail)
+        # Trim insignificant bits (the ones after the end of the path) and convert the rest at once:
+        key = (key_int & ((1 << bits_len) - 1)).to_bytes(whole_bytes_len, "little")
 
-        return bytes(result)
+        return _LEB128_LENGTHS[bits_len] + key
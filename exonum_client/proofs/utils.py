@@ -1,13 +1,16 @@
 """Common Utils for Proofs Modules."""
-from typing import Any, Dict, Callable, Optional
+from typing import Any, Dict, Callable
 from logging import getLogger
-import re
 
 # Those utils are internal and very simple, so they don't require docs.
 # pylint: disable=missing-docstring
 # pylint: disable=C0103
 logger = getLogger(__name__)
 
+# Hashes are checked for every proof element, so the translation table removing hex digits is built once:
+_HASH_HEX_LEN = 64
+_HEX_DIGITS_REMOVAL = str.maketrans("", "", "0123456789abcdefABCDEF")
+
 
 def is_dict(json: Any) -> bool:
     return isinstance(json, dict)
@@ -17,13 +20,22 @@ def is_field_dict(json: Dict[Any, Any], field: str) -> bool:
     return isinstance(json.get(field), dict)
 
 
+def _is_hash(value: Any) -> bool:
+    # Values of a wrong length are rejected without scanning them:
+    if not isinstance(value, str) or len(value) != _HASH_HEX_LEN:
+        return False
+
+    # Hash contains only hex digits, so nothing remains after removing them:
+    return not value.translate(_HEX_DIGITS_REMOVAL)
+
+
 def is_field_hash(json: Dict[Any, Any], field: str) -> bool:
-    field_value = json.get(field)
-    return isinstance(field_value, str) and bool(re.match(r"^[0-9A-Fa-f]{64}$", field_value))
+    return _is_hash(json.get(field))
 
 
 def is_field_hash_or_none(json: Dict[Any, Any], field: str) -> bool:
-    return not json.get(field) or is_field_hash(json, field)
+    field_value = json.get(field)
+    return not field_value or _is_hash(field_value)
 
 
 def is_field_int(json: Dict[Any, Any], field: str) -> bool:
@@ -31,24 +43,27 @@ def is_field_int(json: Dict[Any, Any], field: str) -> bool:
 
 
 def is_field_convertible(json: Dict[Any, Any], field: str, value_to_bytes: Callable[[Any], bytes]) -> bool:
+    field_value = json.get(field)
+    if not field_value:
+        return False
+
     try:
-        if not json.get(field):
-            return False
-        value_to_bytes(json[field])
+        value_to_bytes(field_value)
         return True
     except ValueError:
         logger.warning("Field '%s' is not convertible.", field)
         return False
 
 
-def to_bytes(hex_data: str) -> Optional[bytes]:
-    if not hex_data:
-        return None
-
-    return bytes.fromhex(hex_data)
+# Heights of the trees for the most common sizes are precomputed (see `calculate_height`):
+_HEIGHTS_CACHE_SIZE = 4096
+_HEIGHTS_CACHE = tuple([1] + [(number - 1).bit_length() + 1 for number in range(1, _HEIGHTS_CACHE_SIZE)])
 
 
 def calculate_height(number: int) -> int:
+    if 0 <= number < _HEIGHTS_CACHE_SIZE:
+        return _HEIGHTS_CACHE[number]
+
     if number < 0:
         logger.warning("Number %s is used for tree height calculation and cannot be less than zero.", number)
         raise ValueError(f"Number {number} is less than zero.")
@@ -81,18 +96,18 @@ def leb128_encode_unsigned(value: int) -> bytes:
         logger.warning("Value passed to LEB128 for unsigned integers should be non-negative.")
         raise ValueError("Value should be non-negative")
 
-    result = []
-    while True:
-        # Lower 7 bits of value:
-        byte = value & 0x7F
-        value >>= 7
+    # Most of the encoded values fit into one byte:
+    if value < 0x80:
+        return bytes((value,))
 
-        if value != 0:  # More bytes to come.
-            byte |= 0x80  # Set high order bit.
+    # Every byte of the result holds 7 bits of the value:
+    bytes_len = (value.bit_length() + 6) // 7
 
-        result.append(byte)
+    encoded = 0
+    for i in range(bytes_len):
+        encoded |= ((value >> (7 * i)) & 0x7F) << (8 * i)
 
-        if value == 0:
-            break
+    # High order bit is set in every byte except for the last one (more bytes to come):
+    encoded |= int.from_bytes(b"\x80" * (bytes_len - 1), "little")
 
-    return bytes(result)
+    return encoded.to_bytes(bytes_len, "little")
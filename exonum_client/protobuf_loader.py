@@ -1,13 +1,15 @@
 """Module Containing the ProtobufLoader Class.
 
 ProtobufLoader is capable of downloading Protobuf sources from Exonum."""
-from typing import List, Optional, Any, NamedTuple
+from typing import List, Optional, Any, NamedTuple, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from logging import getLogger
 import shutil
 import sys
 import os
 import tempfile
-import re
+import threading
 
 from .protoc import Protoc
 
@@ -16,6 +18,17 @@ logger = getLogger(__name__)
 
 PYTHON_RUNTIME = 2
 
+# Symbols of the artifact name and version which are not allowed in the module names are replaced with "_":
+_ARTIFACT_MODULE_NAME_TRANSLATION = str.maketrans("-. :/", "_____")
+
+
+# Names are requested on every import of a service module (e.g. for every created message),
+# while the set of artifacts used by a client is small:
+@lru_cache(maxsize=256)
+def _artifact_module_name(artifact_name: str, artifact_version: str) -> str:
+    """Returns a name of the package with the modules generated for the artifact."""
+    return f"{artifact_name}:{artifact_version}".translate(_ARTIFACT_MODULE_NAME_TRANSLATION)
+
 
 # pylint: disable=inherit-non-class
 class ProtoFile(NamedTuple):
@@ -92,39 +105,55 @@ class ProtobufLoader:
     ValueError will be raised.
     """
 
-    _entity = None
+    _entity: Optional["ProtobufLoader"] = None
     _reference_count = 0
+    # Lock guarding the entity and the reference counter, so the loader can be used from several threads:
+    _lock = threading.RLock()
+
+    # Directory with the generated files and its position in sys.path.
+    # They are shared by all the loader objects, since they exist while there is at least one reference:
+    _proto_dir: Optional[str] = None
+    _sys_path_idx = -1
 
     def __new__(cls, *_args: Any) -> "ProtobufLoader":
-        # Check if the entity is already created (and thus no new object should be created):
-        if ProtobufLoader._entity is not None:
-            return ProtobufLoader._entity
+        with ProtobufLoader._lock:
+            # Check if the entity is already created (and thus no new object should be created):
+            if ProtobufLoader._entity is not None:
+                return ProtobufLoader._entity
 
-        # Create a new object:
-        return super().__new__(cls)
+            # Create a new object. It is registered right away, so the concurrent calls will obtain the same object:
+            entity = super().__new__(cls)
+            ProtobufLoader._entity = entity
+            return entity
 
     def __init__(self, client: Optional[ProtobufProviderInterface] = None):
-        # Check that the client is the same as expected:
-        if ProtobufLoader._entity is not None:
-            if client is not None and client != ProtobufLoader._entity.client:
-                err_msg = (
-                    f"Attempt to create ProtobufLoader entity with a different client:\n"
-                    f"used client:\n{ProtobufLoader._entity.client}\n"
-                    f"provided client:\n{client}\n"
-                )
-                logger.critical(err_msg)
-                raise ValueError(err_msg)
-            return
-
-        if client is None:
-            err_msg = "Client is expected to be set for the initial object creation."
-            logger.critical(err_msg)
-            raise ValueError(err_msg)
-
-        ProtobufLoader._entity = self
-        self.client = client
-        self.protoc = Protoc()
-        self._proto_dir: Optional[str] = None
+        with ProtobufLoader._lock:
+            # Check that the client is the same as expected (if the object is already initialized):
+            used_client = vars(self).get("client")
+            if used_client is not None:
+                if client is not None and client != used_client:
+                    err_msg = (
+                        f"Attempt to create ProtobufLoader entity with a different client:\n"
+                        f"used client:\n{used_client}\n"
+                        f"provided client:\n{client}\n"
+                    )
+                    logger.critical(err_msg)
+                    raise ValueError(err_msg)
+                return
+
+            try:
+                if client is None:
+                    err_msg = "Client is expected to be set for the initial object creation."
+                    logger.critical(err_msg)
+                    raise ValueError(err_msg)
+
+                self.protoc = Protoc()
+            except Exception:
+                # Entity was not created:
+                ProtobufLoader._entity = None
+                raise
+
+            self.client: ProtobufProviderInterface = client
 
     def __enter__(self) -> "ProtobufLoader":
         self.initialize()
@@ -137,68 +166,88 @@ class ProtobufLoader:
     def initialize(self) -> None:
         """Performs an initialization process."""
 
-        # Update the reference counter:
-        ProtobufLoader._reference_count += 1
-        logger.debug("Current ProtobufLoader reference count: %s.", ProtobufLoader._reference_count)
-        if ProtobufLoader._reference_count > 1:
-            # If this is a second (third, etc) entity, everything is already initialized:
-            return
+        with ProtobufLoader._lock:
+            # Update the reference counter:
+            ProtobufLoader._reference_count += 1
+            logger.debug("Current ProtobufLoader reference count: %s.", ProtobufLoader._reference_count)
+            if ProtobufLoader._reference_count > 1:
+                # If this is a second (third, etc) entity, everything is already initialized:
+                return
+
+            # Object could be obtained before the previous entity was removed, in that case it becomes the entity:
+            if ProtobufLoader._entity is None:
+                ProtobufLoader._entity = self
 
-        # Create a directory for temporary files:
-        self._proto_dir = tempfile.mkdtemp(prefix="exonum_client_")
+            # Create a directory for temporary files:
+            proto_dir = tempfile.mkdtemp(prefix="exonum_client_")
+            ProtobufLoader._proto_dir = proto_dir
 
-        # Create a folder for Python files output:
-        python_modules_path = os.path.join(self._proto_dir, "exonum_modules")
-        os.makedirs(python_modules_path)
+            # Create a folder for Python files output:
+            python_modules_path = os.path.join(proto_dir, "exonum_modules")
+            os.makedirs(python_modules_path)
 
-        # Create __init__ file in the exonum_modules directory:
-        init_file_path = os.path.join(python_modules_path, "__init__.py")
-        open(init_file_path, "a").close()
+            # Create __init__ file in the exonum_modules directory:
+            init_file_path = os.path.join(python_modules_path, "__init__.py")
+            open(init_file_path, "a").close()
 
-        # Add a directory with exonum_modules into the Python path:
-        sys.path.append(self._proto_dir)
+            # Add a directory with exonum_modules into the Python path (its position is stored for the removal):
+            ProtobufLoader._sys_path_idx = len(sys.path)
+            sys.path.append(proto_dir)
 
-        logger.debug("Successfully initialized ProtobufLoader for client:\n%s\n", self.client)
+            logger.debug("Successfully initialized ProtobufLoader for client:\n%s\n", self.client)
 
     def deinitialize(self) -> None:
         """Performs a deinitialization process."""
-        if self._proto_dir is None:
-            err_msg = "Attempt to deinitialize uninitialized ProtobufLoader."
-            logger.critical(err_msg)
-            raise RuntimeError(err_msg)
-
-        # Decrement the reference counter:
-        ProtobufLoader._reference_count -= 1
-        logger.debug("Current ProtobufLoader reference count: %s.", ProtobufLoader._reference_count)
-
-        # If there is at least one reference, nothing should be done:
-        if ProtobufLoader._reference_count > 0:
-            return
-
-        # Mark entity as removed:
-        ProtobufLoader._entity = None
-
-        # Remove the generated temporary directory:
-        sys.path.remove(self._proto_dir)
-        shutil.rmtree(self._proto_dir)
-
-        # Unload any previously loaded protobuf modules
-        loaded_modules = list(sys.modules.keys())
-        for module in loaded_modules:
-            if module.startswith("exonum_modules"):
+        with ProtobufLoader._lock:
+            proto_dir = ProtobufLoader._proto_dir
+            if proto_dir is None:
+                err_msg = "Attempt to deinitialize uninitialized ProtobufLoader."
+                logger.critical(err_msg)
+                raise RuntimeError(err_msg)
+
+            # Decrement the reference counter:
+            ProtobufLoader._reference_count -= 1
+            logger.debug("Current ProtobufLoader reference count: %s.", ProtobufLoader._reference_count)
+
+            # If there is at least one reference, nothing should be done:
+            if ProtobufLoader._reference_count > 0:
+                return
+
+            # Mark entity as removed:
+            ProtobufLoader._entity = None
+
+            # Remove the generated temporary directory.
+            # Directory is expected to be at the stored position unless sys.path was modified after the initialization:
+            idx = ProtobufLoader._sys_path_idx
+            if 0 <= idx < len(sys.path) and sys.path[idx] == proto_dir:
+                del sys.path[idx]
+            else:
+                sys.path.remove(proto_dir)
+            shutil.rmtree(proto_dir)
+            ProtobufLoader._proto_dir = None
+            ProtobufLoader._sys_path_idx = -1
+
+            # Unload any previously loaded protobuf modules
+            for module in [module for module in sys.modules if module.startswith("exonum_modules")]:
                 del sys.modules[module]
 
-        logger.debug("Successfully deinitialized ProtobufLoader.")
+            logger.debug("Successfully deinitialized ProtobufLoader.")
 
     @staticmethod
     def _save_proto_file(path: str, file_content: str) -> None:
-        with open(path, "wt") as file_out:
-            file_out.write(file_content)
+        # Content is encoded at once and written without the text layer:
+        with open(path, "wb") as file_out:
+            file_out.write(file_content.encode("utf-8"))
 
     def _save_files(self, path: str, files: List[ProtoFile]) -> None:
+        # Directories which are already created (many files are usually stored in the same directory):
+        created_dirs: Set[str] = set()
         for proto_file in files:
             file_path = os.path.join(path, proto_file.name)
-            os.makedirs(os.path.split(file_path)[0], exist_ok=True)
+            file_dir = os.path.dirname(file_path)
+            if file_dir not in created_dirs:
+                os.makedirs(file_dir, exist_ok=True)
+                created_dirs.add(file_dir)
             self._save_proto_file(file_path, proto_file.content)
 
     def load_main_proto_files(self) -> None:
@@ -222,25 +271,50 @@ class ProtobufLoader:
 
     def load_service_proto_files(self, runtime_id: int, artifact_name: str, artifact_version: str) -> None:
         """Loads and compiles proto files for a service."""
+        self.load_services_proto_files([(runtime_id, artifact_name, artifact_version)])
+
+    def load_services_proto_files(self, artifacts: List[Tuple[int, str, str]]) -> None:
+        """Loads and compiles proto files for several services at once.
+
+        Sources for all the services are requested simultaneously and compiled by protoc
+        processes running in parallel, which is faster than loading services one by one.
+
+        Example:
+
+        >>> with client.protobuf_loader() as loader:
+        >>>    loader.load_main_proto_files()
+        >>>    loader.load_services_proto_files([(0, "exonum-supervisor", "1.0.0"), (0, "exonum-explorer", "1.0.0")])
+
+        Parameters
+        ----------
+        artifacts: List[Tuple[int, str, str]]
+            List of (runtime ID, artifact name, artifact version) tuples.
+        """
         if self._proto_dir is None:
             logger.critical("Attempt to use unititialized ProtobufLoader.")
             raise RuntimeError("Attempt to use unititialized ProtobufLoader")
 
-        # This method is not intended to be used by end users, but it is OK to call it here.
-        # pylint: disable=protected-access
-        proto_contents = self.client.get_proto_sources_for_artifact(runtime_id, artifact_name, artifact_version)
+        def get_sources(artifact: Tuple[int, str, str]) -> List[ProtoFile]:
+            return self.client.get_proto_sources_for_artifact(*artifact)
 
-        # Save proto_sources in proto/artifact_name directory:
-        artifact_name_and_version = f"{artifact_name}:{artifact_version}"
-        service_module_name = re.sub(r"[-. :/]", "_", artifact_name_and_version)
-        service_dir = os.path.join(self._proto_dir, "proto", service_module_name)
-        self._save_files(service_dir, proto_contents)
+        # Sources are requested simultaneously, an error raised for any of the artifacts is propagated:
+        with ThreadPoolExecutor() as executor:
+            artifacts_sources = list(executor.map(get_sources, artifacts))
+
+        compile_sources: List[Tuple[str, str, Optional[str]]] = []
+        for (runtime_id, artifact_name, artifact_version), proto_contents in zip(artifacts, artifacts_sources):
+            # Save proto_sources in proto/artifact_name directory:
+            service_module_name = _artifact_module_name(artifact_name, artifact_version)
+            service_dir = os.path.join(self._proto_dir, "proto", service_module_name)
+            self._save_files(service_dir, proto_contents)
+
+            main_dir = os.path.join(self._proto_dir, "proto", "main")
+            proto_dir = os.path.join(self._proto_dir, "exonum_modules", service_module_name)
+            if runtime_id != PYTHON_RUNTIME:
+                compile_sources.append((service_dir, proto_dir, main_dir))
+            else:
+                # Python services do not rely on the `includes` from the exonum core.
+                compile_sources.append((service_dir, proto_dir, None))
 
         # Call protoc to compile proto sources:
-        main_dir = os.path.join(self._proto_dir, "proto", "main")
-        proto_dir = os.path.join(self._proto_dir, "exonum_modules", service_module_name)
-        if runtime_id != PYTHON_RUNTIME:
-            self.protoc.compile(service_dir, proto_dir, include=main_dir)
-        else:
-            # Python services do not rely on the `includes` from the exonum core.
-            self.protoc.compile(service_dir, proto_dir)
+        self.protoc.compile_many(compile_sources)
@@ -11,6 +11,12 @@ from logging import getLogger
 from exonum_client.protobuf_loader import ProtoFile, ProtobufProviderInterface
 from exonum_client.api import Api
 
+# Responses with the sources may be large, so `orjson` is used to decode them if it is installed:
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads  # type: ignore
+
 # pylint: disable=C0103
 logger = getLogger(__name__)
 
@@ -26,7 +32,7 @@ class ExonumApiProvider(Api, ProtobufProviderInterface):
     def _get_proto_sources(self, params: Optional[Dict[str, str]] = None) -> List[ProtoFile]:
         """Retrieves protobuf sources."""
         proto_sources_endpoint = self._rust_runtime_url.format("proto-sources")
-        response = self.get(proto_sources_endpoint, params=params)
+        response = self.get(proto_sources_endpoint, params=params, session=self._session)
         if response.status_code != 200 or "application/json" not in response.headers["content-type"]:
             logger.critical(
                 "Unsuccessfully attempted to retrieve Protobuf sources.\n" "Status code: %s,\n" "body:\n%s",
@@ -37,7 +43,8 @@ class ExonumApiProvider(Api, ProtobufProviderInterface):
         logger.debug("Protobuf sources retrieved successfully.")
 
         proto_files = [
-            ProtoFile(name=proto_file["name"], content=proto_file["content"]) for proto_file in response.json()
+            ProtoFile(name=proto_file["name"], content=proto_file["content"])
+            for proto_file in json_loads(response.content)
         ]
 
         return proto_files
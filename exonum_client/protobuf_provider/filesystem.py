@@ -1,8 +1,7 @@
 """Protobuf provider which loads .proto files from the filesystem."""
 
-import glob
 import os
-from typing import List
+from typing import List, Set
 
 from exonum_client.protobuf_loader import ProtobufProviderInterface, ProtoFile
 
@@ -37,10 +36,31 @@ class _FilesystemProtobufProvider(ProtobufProviderInterface):
     def _get_sources(self) -> List[ProtoFile]:
         result: List[ProtoFile] = []
 
-        for name in glob.glob(self._path + "/**/*.proto", recursive=True):
-            with open(name, "r") as proto_file:
-                file_content = proto_file.read()
+        # Names of the files are relative to the sources folder:
+        prefix_len = len(os.path.join(self._path, ""))
 
-            result.append(ProtoFile(name=os.path.relpath(name, self._path), content=file_content))
+        # Symbolic links to folders are followed, so every folder is walked only once to avoid the infinite
+        # recursion on the links to the parent folders:
+        walked_dirs: Set[str] = set()
+
+        for dir_path, dir_names, file_names in os.walk(self._path, followlinks=True):
+            real_dir_path = os.path.realpath(dir_path)
+            if real_dir_path in walked_dirs:
+                dir_names.clear()
+                continue
+            walked_dirs.add(real_dir_path)
+
+            # Hidden folders and files are skipped:
+            dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+
+            for file_name in file_names:
+                if file_name.startswith(".") or not file_name.endswith(".proto"):
+                    continue
+
+                path = os.path.join(dir_path, file_name)
+                with open(path, "rb") as proto_file:
+                    file_content = proto_file.read().decode("utf-8")
+
+                result.append(ProtoFile(name=path[prefix_len:], content=file_content))
 
         return result
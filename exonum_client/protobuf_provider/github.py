@@ -1,34 +1,52 @@
 """Protobuf provider which loads .proto files from GitHub."""
 
+from concurrent.futures import ThreadPoolExecutor
 import os
-import re
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 import requests
 
 from exonum_client.protobuf_loader import ProtobufProviderInterface, ProtoFile
 
 
+def _is_valid_name(name: str) -> bool:
+    # Organization, repo and ref names consist of word characters, dots and dashes:
+    return bool(name) and all(char.isalnum() or char in "_.-" for char in name)
+
+
 class _GithubProtobufProvider(ProtobufProviderInterface):
 
-    GITHUB_URL_REGEX = re.compile(
-        r"https://github.com/(?P<organization>[\w.-]+)/(?P<repo>[\w.-]+)/tree/(?P<ref>[\w.-]+)/(?P<path>.+)"
-    )
+    GITHUB_URL_PREFIX = "https://github.com/"
+    GITHUB_API_URL_PREFIX = "https://api.github.com/repos/"
+    GITHUB_RAW_URL_PREFIX = "https://raw.githubusercontent.com/"
 
-    def __init__(self, service_name: str, service_version: str, github_folder_path: str) -> None:
-        match = self.GITHUB_URL_REGEX.match(github_folder_path)
+    # Amount of the simultaneous requests to GitHub.
+    # It is kept small, since many concurrent requests may trigger the GitHub secondary rate limits:
+    MAX_WORKERS = 4
 
-        if not match:
+    def __init__(self, service_name: str, service_version: str, github_folder_path: str) -> None:
+        # Expected path format is "https://github.com/<organization>/<repo>/tree/<ref>/<path>":
+        parts = github_folder_path[len(self.GITHUB_URL_PREFIX) :].split("/", 4)
+
+        if (
+            not github_folder_path.startswith(self.GITHUB_URL_PREFIX)
+            or len(parts) != 5
+            or parts[2] != "tree"
+            or not all(_is_valid_name(name) for name in (parts[0], parts[1], parts[3]))
+            or not parts[4]
+        ):
             raise RuntimeError(f"Invalid github folder path: {github_folder_path}")
 
-        self._organization = match.group("organization")
-        self._repo = match.group("repo")
-        self._ref = match.group("ref")
-        self._path = match.group("path")
+        organization, repo, _, self._ref, self._path = parts
+        self._repo = f"{organization}/{repo}"
         self._is_main = service_name == "_main"
         if not self._is_main:
             self._service_name = service_name
             self._service_version = service_version
 
+        # Session keeps connections to GitHub alive between requests:
+        self._session = requests.Session()
+
     def get_main_proto_sources(self) -> List[ProtoFile]:
         """Gets the Exonum core proto sources."""
         if not self._is_main:
@@ -46,25 +64,95 @@ class _GithubProtobufProvider(ProtobufProviderInterface):
         return self._get_sources()
 
     def _get_sources(self) -> List[ProtoFile]:
-        results: List[ProtoFile] = []
-        self._get_sources_recursive(self._path, results)
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            files = self._find_files_in_tree()
+            if files is None:
+                files = self._find_files_in_dirs(executor)
+
+            # When all the files are found, they are downloaded simultaneously.
+            # Files are downloaded from raw.githubusercontent.com, so these requests do not count against
+            # the GitHub API rate limit:
+            contents = executor.map(self._get_file_content, [download_url for _, download_url in files])
+
+            return [ProtoFile(name=name, content=content) for (name, _), content in zip(files, contents)]
+
+    def _proto_file_name(self, file_path: str) -> str:
+        dir_path, name = os.path.split(file_path)
+
+        return os.path.join(dir_path.replace("src/", ""), name) if self._is_main else name
+
+    def _find_files_in_tree(self) -> Optional[List[Tuple[str, str]]]:
+        # Whole tree of the repository is obtained with one request.
+        # Returns names and download urls of the found files or None if the tree is too big to be obtained at once.
+        tree_url = f"{self.GITHUB_API_URL_PREFIX}{self._repo}/git/trees/{self._ref}?recursive=1"
+        tree = self._get_api_json(tree_url)
+
+        if not isinstance(tree, dict) or "tree" not in tree:
+            raise RuntimeError(f"Unexpected response of the GitHub API ({tree_url}): {tree!r}")
+
+        if tree.get("truncated"):
+            return None
+
+        path_prefix = self._path.rstrip("/") + "/"
+
+        return [
+            (self._proto_file_name(entry["path"]), self._raw_file_url(entry["path"]))
+            for entry in tree["tree"]
+            if entry["type"] == "blob" and entry["path"].startswith(path_prefix) and entry["path"].endswith(".proto")
+        ]
+
+    def _find_files_in_dirs(self, executor: ThreadPoolExecutor) -> List[Tuple[str, str]]:
+        # Directories are traversed level by level, listings of the directories of one level are requested
+        # simultaneously. Returns names and download urls of the found files.
+        files: List[Tuple[str, str]] = []
+
+        paths = [self._path]
+        while paths:
+            next_paths: List[str] = []
+            for content in executor.map(self._get_dir_content, paths):
+                for source_file in content:
+                    _name = source_file["name"]
+                    _type = source_file["type"]
+
+                    if _type == "file" and _name.endswith(".proto"):
+                        files.append((self._proto_file_name(source_file["path"]), source_file["download_url"]))
+
+                    if _type == "dir":
+                        next_paths.append(source_file["path"])
+
+            paths = next_paths
+
+        return files
+
+    def _get_dir_content(self, path: str) -> List[Dict[str, Any]]:
+        content_url = f"{self.GITHUB_API_URL_PREFIX}{self._repo}/contents/{path}?ref={self._ref}"
+        content = self._get_api_json(content_url)
+
+        if not isinstance(content, list):
+            raise RuntimeError(f"Unexpected response of the GitHub API ({content_url}): {content!r}")
 
-        return results
+        return content
 
-    def _get_sources_recursive(self, path: str, results: List[ProtoFile]) -> None:
-        content_url = f"https://api.github.com/repos/{self._organization}/{self._repo}/contents/{path}?ref={self._ref}"
+    def _raw_file_url(self, path: str) -> str:
+        return f"{self.GITHUB_RAW_URL_PREFIX}{self._repo}/{self._ref}/{quote(path)}"
 
-        content = requests.get(content_url)
+    def _get_api_json(self, url: str) -> Any:
+        response = self._session.get(url)
+        if not response.ok:
+            # Body of the error response (e.g. when the rate limit is exceeded) contains the error description:
+            raise RuntimeError(
+                f"Unsuccessfully attempted to request the GitHub API ({url}).\n"
+                f"Status code: {response.status_code},\nbody:\n{response.content!r}"
+            )
 
-        for source_file in content.json():
-            _name = source_file["name"]
-            _type = source_file["type"]
+        return response.json()
 
-            if _type == "file" and _name.endswith(".proto"):
-                file_content = requests.get(source_file["download_url"]).content.decode("utf-8")
-                full_name = os.path.join(path.replace("src/", ""), _name) if self._is_main else _name
-                results.append(ProtoFile(name=full_name, content=file_content))
+    def _get_file_content(self, download_url: str) -> str:
+        response = self._session.get(download_url)
+        if not response.ok:
+            raise RuntimeError(
+                f"Unsuccessfully attempted to download a proto file ({download_url}).\n"
+                f"Status code: {response.status_code},\nbody:\n{response.content!r}"
+            )
 
-            if _type == "dir":
-                _path = source_file["path"]
-                self._get_sources_recursive(_path, results)
+        return response.content.decode("utf-8")
@@ -37,6 +37,13 @@ class ProtobufProvider(ProtobufProviderInterface):
         """Constructor of the ProtobufProvider class."""
         self._lookup: Dict[str, ProtobufProviderInterface] = dict()
         self._fallback: Dict[int, ProtobufProviderInterface] = dict()
+        # Sources which are already obtained, "_main_" for the main sources and "<runtime_id>:<name>_<version>"
+        # for the artifacts sources:
+        self._proto_cache: Dict[str, List[ProtoFile]] = dict()
+
+    def invalidate(self) -> None:
+        """Removes all the cached sources, so they will be obtained from the providers again."""
+        self._proto_cache.clear()
 
     def add_fallback_provider(self, runtime_id: int, fallback_probider: ProtobufProviderInterface) -> None:
         """Adds a provider which will be used if provider for required service
@@ -45,6 +52,9 @@ class ProtobufProvider(ProtobufProviderInterface):
 
         self._fallback[runtime_id] = fallback_probider
 
+        # Sources obtained from the previous fallback provider may differ:
+        self.invalidate()
+
     def add_main_source(self, source_path: str) -> None:
         """Adds a main source for common Exonum protobuf files.
 
@@ -80,8 +90,15 @@ class ProtobufProvider(ProtobufProviderInterface):
         else:
             raise ValueError(f"Incorrect source path: {source_path}")
 
+        # Sources could be obtained from a fallback provider before the source was added:
+        self.invalidate()
+
     def get_main_proto_sources(self) -> List[ProtoFile]:
         """Gets the Exonum core proto sources."""
+        cached_sources = self._proto_cache.get("_main_")
+        if cached_sources is not None:
+            return list(cached_sources)
+
         provider = self._lookup.get("_main_")
         if provider is None:
             rust_runtime_provider = self._fallback.get(self.RUST_RUNTIME_ID)
@@ -93,13 +110,21 @@ class ProtobufProvider(ProtobufProviderInterface):
 
             provider = rust_runtime_provider
 
-        return provider.get_main_proto_sources()
+        sources = provider.get_main_proto_sources()
+        self._proto_cache["_main_"] = list(sources)
+
+        return sources
 
     def get_proto_sources_for_artifact(
         self, runtime_id: int, artifact_name: str, artifact_version: str
     ) -> List[ProtoFile]:
         """Gets the Exonum service proto sources."""
         verbose_service_name = f"{artifact_name}_{artifact_version}"
+        cache_key = f"{runtime_id}:{verbose_service_name}"
+        cached_sources = self._proto_cache.get(cache_key)
+        if cached_sources is not None:
+            return list(cached_sources)
+
         provider = self._lookup.get(verbose_service_name)
         if provider is None:
             fallback_provider = self._fallback.get(runtime_id)
@@ -111,4 +136,7 @@ class ProtobufProvider(ProtobufProviderInterface):
 
             provider = fallback_provider
 
-        return provider.get_proto_sources_for_artifact(runtime_id, artifact_name, artifact_version)
+        sources = provider.get_proto_sources_for_artifact(runtime_id, artifact_name, artifact_version)
+        self._proto_cache[cache_key] = list(sources)
+
+        return sources
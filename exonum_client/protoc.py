@@ -1,7 +1,9 @@
 """Module with the Bindings to Protoc."""
-from typing import List, Optional
+from typing import Callable, Deque, Dict, List, Match, Optional, Pattern, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from logging import getLogger
-import glob
 import os
 import re
 import shutil
@@ -12,18 +14,73 @@ logger = getLogger(__name__)
 
 PROTOC_ENV_NAME = "PROTOC"
 PROTOC_MIN_VERSION = (3, 6, 1)
+# Large sets of files are split between several protoc processes, each of them compiles at least this amount of files:
+PROTOC_MIN_FILES_PER_PROCESS = 32
+# Maximum amount of protoc processes running simultaneously:
+PROTOC_MAX_PROCESSES = os.cpu_count() or 1
 
 
 def _find_protoc() -> Optional[str]:
     if PROTOC_ENV_NAME in os.environ:
         return os.getenv(PROTOC_ENV_NAME)
 
+    return _which_protoc()
+
+
+# Lookup of protoc in PATH and the version check are performed for every Protoc object,
+# so their results are computed once per process (per protoc path for the version):
+@lru_cache(maxsize=1)
+def _which_protoc() -> Optional[str]:
     return shutil.which("protoc")
 
 
+@lru_cache(maxsize=None)
+def _get_protoc_version(protoc_path: str) -> Tuple[int, ...]:
+    protoc_args = [protoc_path, "--version"]
+    version_stdout = subprocess.run(protoc_args, stdout=subprocess.PIPE, check=True).stdout
+
+    # Convert bytestring to string and split into words.
+    # b'libprotoc 3.7.1\n' => ['libprotoc', '3.7.1']
+    version = version_stdout.decode("utf-8").strip().split()
+
+    # Expected output is like 'libprotoc 3.7.1'
+    if len(version) != 2 or not re.match(r"\d+.\d+.\d+", version[1]):
+        raise RuntimeError(f"Unexpected output on resolving protoc version: {version}")
+
+    # "3.7.1" => (3, 7, 1)
+    return tuple(map(int, version[1].split(".")))
+
+
 def _find_files_recursive(path: str, extension: str) -> List[str]:
-    pattern = os.path.join(path, "**", f"*{extension}")
-    return glob.glob(pattern, recursive=True)
+    # Folders are scanned directly instead of matching a recursive glob pattern. Like glob,
+    # hidden folders and files are skipped and symbolic links to folders are followed.
+    # Entries of os.scandir provide the kind and the full path of the file without additional calls:
+    result: List[str] = []
+    dir_paths = [path]
+    while dir_paths:
+        try:
+            entries = os.scandir(dir_paths.pop())
+        except OSError:
+            # Unreadable or missing folders are skipped as well:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+
+                if entry.is_dir():
+                    dir_paths.append(entry.path)
+                elif entry.name.endswith(extension):
+                    result.append(entry.path)
+
+    return result
+
+
+def _touch(path: str) -> None:
+    # File is created (if it does not exist) without the buffered file object, it is never written.
+    # Permissions are the same as for `open` (default mode with the umask applied):
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o666))
 
 
 class Protoc:
@@ -41,42 +98,20 @@ class Protoc:
         self._ensure_protoc_version()
 
     @staticmethod
-    def _modify_file(path: str, modules: List[str]) -> None:
+    def _modify_file(path: str, service_imports_re: Optional[Pattern[bytes]]) -> None:
         # This method modifies imports in the generated files to be relative:
-
-        # Default os.path.join is too goofy for this case.
-        def _partial_path(path: str) -> str:
-            return os.path.sep + path + os.path.sep
-
-        root_path = _partial_path("exonum")
-        nested_paths = [_partial_path("proof"), _partial_path("runtime")]
-
-        for nested_path in nested_paths:
-            if nested_path in path:
-                _modify_main_nested_file(path)
-                return
-
-        if root_path in path:
-            _modify_main_file(path)
+        rule = _find_main_file_rule(os.path.dirname(path))
+        if rule is None:
+            _modify_service_file(path, service_imports_re)
             return
 
-        _modify_service_file(path, modules)
+        # Imports without a replacement are left as is:
+        _, imports = rule
+        _rewrite_file(path, _EXONUM_IMPORTS_RE, lambda match: imports.get(match.group(1), match.group(0)))
 
     def _ensure_protoc_version(self) -> None:
         """Checks that installed protoc has sufficient version."""
-        protoc_args = [self._protoc_path, "--version"]
-        version_stdout = subprocess.run(protoc_args, stdout=subprocess.PIPE, check=True).stdout
-
-        # Convert bytestring to string and split into words.
-        # b'libprotoc 3.7.1\n' => ['libprotoc', '3.7.1']
-        version = version_stdout.decode("utf-8").strip().split()
-
-        # Expected output is like 'libprotoc 3.7.1'
-        if len(version) != 2 or not re.match(r"\d+.\d+.\d+", version[1]):
-            raise RuntimeError(f"Unexpected output on resolving protoc version: {version}")
-
-        # "3.7.1" => (3, 7, 1)
-        parsed_version = tuple(map(int, version[1].split(".")))
+        parsed_version = _get_protoc_version(self._protoc_path)
         if parsed_version < PROTOC_MIN_VERSION:
             raise RuntimeError(
                 f"Installed version of protoc is too old: {parsed_version}, install at least {PROTOC_MIN_VERSION}"
@@ -94,75 +129,200 @@ class Protoc:
         include: Optional[str]
             Includes.
         """
+        self.compile_many([(path_in, path_out, include)])
+
+    def compile_many(self, sources: List[Tuple[str, str, Optional[str]]]) -> None:
+        """Compiles several sets of .proto files.
+        Protoc processes for the sets are run simultaneously, so the startup of protoc
+        is not paid for every set sequentially. Amount of the running processes is limited
+        by `PROTOC_MAX_PROCESSES`.
+
+        Parameters
+        ----------
+        sources: List[Tuple[str, str, Optional[str]]]
+            List of (input folder, output folder, includes) tuples, see `compile`.
+        """
+        # Includes are shared between the compiled sets (e.g. the main Exonum files are included by every service),
+        # so proto files in every folder are searched once per call:
+        folders_files: Dict[str, List[str]] = {}
+        # Sets which are being compiled as (protoc processes, proto files, output folder) tuples:
+        compiling: Deque[Tuple[List[subprocess.Popen], List[str], str]] = deque()
+        try:
+            for path_in, path_out, include in sources:
+                protoc_args, proto_files = self._prepare_compilation(path_in, path_out, include, folders_files)
+
+                # Files are split into chunks compiled by the separate processes. All the processes use the same
+                # proto paths and output folder, so the results are merged in the output folder:
+                processes_amount = max(1, min(PROTOC_MAX_PROCESSES, len(proto_files) // PROTOC_MIN_FILES_PER_PROCESS))
+
+                # Sets started earlier are finished until there is room for the processes of this set:
+                while compiling and _processes_amount(compiling) + processes_amount > PROTOC_MAX_PROCESSES:
+                    self._finish_compilation(*compiling[0])
+                    compiling.popleft()
+
+                # Processes are registered as soon as they are started, so they are stopped if the startup fails.
+                # Processes outlive this loop, so they are not started in `with` blocks: they are waited for
+                # in `_finish_compilation` or killed and waited for in the `finally` block below.
+                # Output of protoc is not used, only errors are collected:
+                protoc_processes: List[subprocess.Popen] = []
+                compiling.append((protoc_processes, proto_files, path_out))
+                for idx in range(processes_amount):
+                    chunk = proto_files[idx::processes_amount]
+                    # pylint: disable=consider-using-with
+                    protoc_processes.append(
+                        subprocess.Popen(protoc_args + chunk, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                    )
+
+            while compiling:
+                self._finish_compilation(*compiling[0])
+                compiling.popleft()
+        finally:
+            # Processes of the sets which were not finished because of an error are stopped:
+            for protoc_processes, _, _ in compiling:
+                for protoc_process in protoc_processes:
+                    protoc_process.kill()
+                    protoc_process.communicate()
+
+    def _prepare_compilation(
+        self, path_in: str, path_out: str, include: Optional[str], folders_files: Dict[str, List[str]]
+    ) -> Tuple[List[str], List[str]]:
+        # Returns protoc arguments (except the files) and files to be compiled.
+        # Proto files found in the folders are stored in `folders_files`, so they are not searched again:
         os.makedirs(path_out)
 
-        init_file_path = os.path.join(path_out, "__init__.py")
-        open(init_file_path, "a").close()
+        _touch(os.path.join(path_out, "__init__.py"))
 
-        if include:
-            protoc_args = [
-                self._protoc_path,
-                "--proto_path={}".format(path_in),
-                "--proto_path={}".format(include),
-                "--python_out={}".format(path_out),
-            ]
-        else:
-            protoc_args = [self._protoc_path, "--proto_path={}".format(path_in), "--python_out={}".format(path_out)]
-
-        proto_files = _find_files_recursive(path_in, "*.proto")
-        if include:
-            proto_files.extend(_find_files_recursive(include, "*.proto"))
-        protoc_args.extend(proto_files)
-        protoc_process = subprocess.Popen(protoc_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        code = protoc_process.wait()
-        (_, stderr) = protoc_process.communicate()
-        if code == 0:
+        # Folder used both as the input and the include one is passed to protoc once,
+        # otherwise its files would be compiled twice:
+        proto_paths = [path_in]
+        if include and include != path_in:
+            proto_paths.append(include)
+
+        protoc_args = [self._protoc_path]
+        protoc_args.extend("--proto_path={}".format(proto_path) for proto_path in proto_paths)
+        protoc_args.append("--python_out={}".format(path_out))
+
+        proto_files = []
+        for proto_path in proto_paths:
+            if proto_path not in folders_files:
+                folders_files[proto_path] = _find_files_recursive(proto_path, ".proto")
+            proto_files.extend(folders_files[proto_path])
+
+        return protoc_args, proto_files
+
+    def _finish_compilation(
+        self, protoc_processes: List[subprocess.Popen], proto_files: List[str], path_out: str
+    ) -> None:
+        errors = []
+        for protoc_process in protoc_processes:
+            (_, stderr) = protoc_process.communicate()
+            if protoc_process.returncode != 0:
+                errors.append(stderr.decode("utf-8"))
+
+        if not errors:
             logger.debug("Proto files were compiled successfully: %s", proto_files)
         else:
-            logger.error("Error acquired while compiling files: %s. Files: %s.", stderr.decode("utf-8"), proto_files)
+            logger.error("Error acquired while compiling files: %s. Files: %s.", "".join(errors), proto_files)
 
-        modules = [proto_path.split(os.path.sep)[-1].replace(".proto", "") for proto_path in proto_files]
-        for file in _find_files_recursive(path_out, "*.py"):
-            open(os.path.join(os.path.split(file)[0], "__init__.py"), "a").close()
-            self._modify_file(file, modules)
+        modules = [os.path.splitext(os.path.basename(proto_path))[0] for proto_path in proto_files]
+        service_imports_re = _service_imports_re(modules)
 
+        # Every folder with generated files is a package, `__init__.py` is created once per folder
+        # (the one in the output folder is created before the compilation):
+        package_dirs = {path_out}
+        generated_files = _find_files_recursive(path_out, ".py")
+        for file in generated_files:
+            file_dir = os.path.dirname(file)
+            if file_dir not in package_dirs:
+                _touch(os.path.join(file_dir, "__init__.py"))
+                package_dirs.add(file_dir)
 
-def _modify_main_file(path: str) -> None:
-    # This function modifies imports in files generated by protoc to be relative.
-    # Top level files are modified by this function. E.g. blockchain_pb2.py, messages_pb2.py.
-    with open(path, "rt") as file_in:
-        file_content = file_in.readlines()
-    with open(path, "wt") as file_out:
-        for line in file_content:
-            line = line.replace("from exonum import ", "from . import ")
-            line = line.replace("from exonum.crypto import ", "from .crypto import ")
-            line = line.replace("from exonum.runtime import ", "from .runtime import ")
-            line = line.replace("from exonum.proof import ", "from .proof import ")
-            file_out.write(line)
-
-
-def _modify_main_nested_file(path: str) -> None:
-    # This function modifies imports in files generated by protoc to be relative.
-    # Nested files are modified by this function. E.g. proof/list_proof_pb2.py, runtime/base_pb2.py.
-    with open(path, "rt") as file_in:
-        file_content = file_in.readlines()
-    with open(path, "wt") as file_out:
-        for line in file_content:
-            line = line.replace("from exonum import ", "from .. import ")
-            line = line.replace("from exonum.crypto import ", "from ..crypto import ")
-            line = line.replace("from exonum.runtime import ", "from . import ")
-            file_out.write(line)
-
-
-def _modify_service_file(path: str, modules: List[str]) -> None:
+        # Files are modified independently, so file operations for different files are performed in parallel:
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(lambda file: self._modify_file(file, service_imports_re), generated_files))
+
+
+def _processes_amount(compiling: Deque[Tuple[List[subprocess.Popen], List[str], str]]) -> int:
+    return sum(len(protoc_processes) for protoc_processes, _, _ in compiling)
+
+
+# Imports of the Exonum modules in the files generated by protoc are matched by one pattern,
+# replacements are selected by the imported submodule (`None` is the top level module).
+# Files are processed as bytes, since generated sources are only searched for ASCII imports:
+_EXONUM_IMPORTS_RE = re.compile(rb"from exonum(\.crypto|\.runtime|\.proof)? import ")
+_MAIN_FILE_IMPORTS = {
+    None: b"from . import ",
+    b".crypto": b"from .crypto import ",
+    b".runtime": b"from .runtime import ",
+    b".proof": b"from .proof import ",
+}
+_MAIN_NESTED_FILE_IMPORTS = {
+    None: b"from .. import ",
+    b".crypto": b"from ..crypto import ",
+    b".runtime": b"from . import ",
+}
+
+
+def _partial_path(path: str) -> str:
+    # Default os.path.join is too goofy for this case.
+    return os.path.sep + path + os.path.sep
+
+
+# Rules for the main Exonum files as (part of the file path, replacements) tuples.
+# The first rule matching the file path is applied, so nested files (e.g. proof/list_proof_pb2.py,
+# runtime/base_pb2.py) go before the top level ones (e.g. blockchain_pb2.py, messages_pb2.py).
+# Files not matching any rule are service files (e.g. service_pb2.py, schema_pb2.py):
+_MainFileRule = Tuple[str, Dict[Optional[bytes], bytes]]
+_MAIN_FILE_RULES: List[_MainFileRule] = [
+    (_partial_path("proof"), _MAIN_NESTED_FILE_IMPORTS),
+    (_partial_path("runtime"), _MAIN_NESTED_FILE_IMPORTS),
+    (_partial_path("exonum"), _MAIN_FILE_IMPORTS),
+]
+
+
+# Many generated files are stored in the same folder, so the rule is selected once per folder.
+# Path parts of the rules end with a separator, so only the folder of the file is matched against them:
+@lru_cache(maxsize=256)
+def _find_main_file_rule(file_dir: str) -> Optional[_MainFileRule]:
+    dir_path = os.path.join(file_dir, "")
+    return next((rule for rule in _MAIN_FILE_RULES if rule[0] in dir_path), None)
+
+
+def _rewrite_file(path: str, pattern: Pattern[bytes], replace: Callable[[Match[bytes]], bytes]) -> None:
+    # Generated files are small enough to be processed as a whole, so the file is read and written at once:
+    with open(path, "rb") as file_in:
+        file_content = file_in.read()
+
+    new_content, replacements_amount = pattern.subn(replace, file_content)
+    # Files without the imports to be replaced (e.g. ones without dependencies) are not written back:
+    if replacements_amount == 0:
+        return
+
+    with open(path, "wb") as file_out:
+        file_out.write(new_content)
+
+
+def _service_imports_re(modules: List[str]) -> Optional[Pattern[bytes]]:
+    # Imports of the exonum modules and imports of the service modules (at the beginning of the line)
+    # are matched by one pattern. Modules are the same for all the files of the compiled set,
+    # so the pattern is built once per set:
+    if not modules:
+        return None
+
+    service_imports = b"|".join(re.escape(module.encode("utf-8") + b"_pb2 ") for module in modules)
+    return re.compile(b"from exonum|^import (?:" + service_imports + b")", re.MULTILINE)
+
+
+def _replace_service_import(match: Match[bytes]) -> bytes:
+    if match.group(0) == b"from exonum":
+        return b"from .exonum"
+    return b"from . " + match.group(0)
+
+
+def _modify_service_file(path: str, imports_re: Optional[Pattern[bytes]]) -> None:
     # This function modifies imports in files generated by protoc to be relative.
     # Service files are modified by this function. E.g. service_pb2.py, schema_pb2.py.
-    with open(path, "rt") as file_in:
-        file_content = file_in.readlines()
-    with open(path, "wt") as file_out:
-        for line in file_content:
-            for module in modules:
-                line = line.replace("from exonum", "from .exonum")
-                if line.startswith("import {}_pb2 ".format(module)):
-                    line = line.replace("import {}_pb2 ".format(module), "from . import {}_pb2 ".format(module))
-            file_out.write(line)
+    if imports_re is None:
+        return
+
+    _rewrite_file(path, imports_re, _replace_service_import)
@@ -11,35 +11,104 @@ from exonum_client.api import Api, PublicApi, PrivateApi, ServiceApi
 from .testing_utils import *
 
 
-class TestApi(unittest.TestCase):
+class MockedRequestsTestCase(unittest.TestCase):
+    # Requests of this API class are mocked once for all the tests of the test case:
+    API_CLASS = Api
+
+    @classmethod
+    def setUpClass(cls):
+        cls._patchers = [
+            patch.object(cls.API_CLASS, "get", new=mock_requests_get),
+            patch.object(cls.API_CLASS, "post", new=mock_requests_post),
+        ]
+        for patcher in cls._patchers:
+            patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        for patcher in cls._patchers:
+            patcher.stop()
+
+
+class TestApi(MockedRequestsTestCase):
+    PRIVATE_URL_BASE = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PRIVATE_PORT)
+
     def setUp(self):
         self.api = Api(EXONUM_IP, EXONUM_PUBLIC_PORT, EXONUM_PROTO)
 
-    @patch("exonum_client.api.Api.get", new=mock_requests_get)
     def test_get(self):
-        url = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PRIVATE_PORT)
-        url += SYSTEM_ENDPOINT_POSTFIX.format("stats")
+        url = self.PRIVATE_URL_BASE + SYSTEM_ENDPOINT_POSTFIX.format("stats")
         resp = self.api.get(url)
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.Api.post", new=mock_requests_post)
     def test_post(self):
-        url = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PRIVATE_PORT)
-        url += SYSTEM_ENDPOINT_POSTFIX.format("shutdown")
+        url = self.PRIVATE_URL_BASE + SYSTEM_ENDPOINT_POSTFIX.format("shutdown")
         resp = self.api.post(url)
         self.assertEqual(resp.status_code, 200)
 
+    def test_close(self):
+        with patch.object(self.api._session, "close") as session_close:
+            self.api.close()
+
+        session_close.assert_called_once_with()
+
+    def test_context_manager(self):
+        session = Mock()
+        with PublicApi(EXONUM_IP, EXONUM_PUBLIC_PORT, EXONUM_PROTO, session=session) as public_api:
+            self.assertIsInstance(public_api, PublicApi)
+            session.close.assert_not_called()
+
+        session.close.assert_called_once_with()
+
+    def test_default_session(self):
+        public_api = PublicApi(EXONUM_IP, EXONUM_PUBLIC_PORT, EXONUM_PROTO)
+        private_api = PrivateApi(EXONUM_IP, EXONUM_PRIVATE_PORT, EXONUM_PROTO)
+
+        self.assertIs(public_api._session, Api.default_session())
+        self.assertIs(private_api._session, Api.default_session())
+
+    def test_session(self):
+        session = Mock()
+        service_api = ServiceApi("service", EXONUM_IP, EXONUM_PUBLIC_PORT, EXONUM_PROTO, session=session)
+
+        self.assertIs(service_api._session, session)
+
+
+class TestApiStaticRequests(unittest.TestCase):
+    def test_get(self):
+        session = Mock()
+        with patch.object(Api, "default_session", return_value=session):
+            response = Api.get("url", params={"key": "value"})
+
+        session.get.assert_called_once_with("url", params={"key": "value"})
+        self.assertIs(response, session.get.return_value)
+
+    def test_post(self):
+        session = Mock()
+        with patch.object(Api, "default_session", return_value=session):
+            response = Api.post("url", data="data", headers={})
+
+        session.post.assert_called_once_with("url", data="data", headers={})
+        self.assertIs(response, session.post.return_value)
+
+    def test_provided_session(self):
+        session = Mock()
+        response = Api.get("url", session=session)
+
+        session.get.assert_called_once_with("url", params=None)
+        self.assertIs(response, session.get.return_value)
+
+
+class TestPublicApi(MockedRequestsTestCase):
+    API_CLASS = PublicApi
 
-class TestPublicApi(unittest.TestCase):
     def setUp(self):
         self.public_api = PublicApi(EXONUM_IP, EXONUM_PUBLIC_PORT, EXONUM_PROTO)
 
-    @patch("exonum_client.api.PublicApi.post", new=mock_requests_post)
     def test_send_transaction(self):
         resp = self.public_api.send_transaction(Mock())
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.PublicApi.get", new=mock_requests_get)
     def test_get_block(self):
         height = random.randrange(0, 20)
         resp = self.public_api.get_block(height)
@@ -54,7 +123,6 @@ class TestPublicApi(unittest.TestCase):
         resp = self.public_api.get_block(height)
         self.assertEqual(resp.status_code, 400)
 
-    @patch("exonum_client.api.PublicApi.get", new=mock_requests_get)
     def test_get_blocks(self):
         count = random.randrange(0, 10)
         resp = self.public_api.get_blocks(count)
@@ -74,7 +142,6 @@ class TestPublicApi(unittest.TestCase):
         resp = self.public_api.get_blocks(count, latest=latest, earliest=earliest)
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.PublicApi.get", new=mock_requests_get)
     def test_get_tx_info(self):
         tx_hash = "-" * 64
         resp = self.public_api.get_tx_info(tx_hash)
@@ -85,33 +152,30 @@ class TestPublicApi(unittest.TestCase):
         self.assertEqual(resp.status_code, 200)
 
 
-class TestPrivateApi(unittest.TestCase):
+class TestPrivateApi(MockedRequestsTestCase):
+    API_CLASS = PrivateApi
+
     def setUp(self):
         self.private_api = PrivateApi(EXONUM_IP, EXONUM_PRIVATE_PORT, EXONUM_PROTO)
 
-    @patch("exonum_client.api.PrivateApi.get", new=mock_requests_get)
     def test_get_info(self):
         resp = self.private_api.get_info()
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.PrivateApi.get", new=mock_requests_get)
     def test_get_stats(self):
         resp = self.private_api.get_stats()
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.PrivateApi.post", new=mock_requests_post)
     def test_add_peer(self):
         address = "address"
         public_key = "public_key"
         resp = self.private_api.add_peer(address, public_key)
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.PrivateApi.post", new=mock_requests_post)
     def test_shutdown(self):
         resp = self.private_api.shutdown()
         self.assertEqual(resp.status_code, 200)
 
-    @patch("exonum_client.api.PrivateApi.post", new=mock_requests_post)
     def test_set_consensus_interaction(self):
         enabled = bool(random.randrange(0, 2))
         resp = self.private_api.set_consensus_interaction(enabled)
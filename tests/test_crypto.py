@@ -33,7 +33,7 @@ class TestFixedByteArray(unittest.TestCase):
     def test_creation(self) -> None:
         """Tests that object is created as expected."""
         length = 10
-        data = bytes([i for i in range(length)])
+        data = bytes(range(length))
 
         # Check that the object is created as expected based on the correct data:
         array = _FixedByteArray(data, length)
@@ -46,8 +46,8 @@ class TestFixedByteArray(unittest.TestCase):
     def test_eq(self) -> None:
         """Tests that __eq__ method works as expected."""
         length = 10
-        data_1 = bytes([i for i in range(length)])
-        data_2 = bytes([i for i in range(length)])
+        data_1 = bytes(range(length))
+        data_2 = bytes(range(length))
 
         array_1 = _FixedByteArray(data_1, length)
         array_2 = _FixedByteArray(data_2, length)
@@ -59,7 +59,7 @@ class TestFixedByteArray(unittest.TestCase):
     def test_str(self) -> None:
         """Tests that __str__ method works as expected."""
         length = 10
-        data = bytes([i for i in range(length)])
+        data = bytes(range(length))
 
         array = _FixedByteArray(data, length)
 
@@ -69,6 +69,11 @@ class TestFixedByteArray(unittest.TestCase):
 class TestCrypto(unittest.TestCase):
     """Tests for all the classes in the Crypto module."""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Key generation is the most expensive operation here, so one keypair is shared by the tests:
+        cls.keypair = KeyPair.generate()
+
     def test_constants(self) -> None:
         """Tests that constants have appropriate values."""
         expected_values = [
@@ -83,7 +88,7 @@ class TestCrypto(unittest.TestCase):
 
     def test_hash(self) -> None:
         """Tests the Hash class."""
-        raw_hash = bytes([0xAB for _ in range(_HASH_BYTES_LEN)])
+        raw_hash = bytes([0xAB]) * _HASH_BYTES_LEN
         hash_obj = Hash(raw_hash)
 
         self.assertTrue(isinstance(hash_obj, _FixedByteArray))
@@ -95,13 +100,13 @@ class TestCrypto(unittest.TestCase):
 
     def test_keys(self) -> None:
         """Tests the PublicKey and the SecretKey classes."""
-        data = bytes([i for i in range(_PUBLIC_KEY_BYTES_LEN)])
+        data = bytes(range(_PUBLIC_KEY_BYTES_LEN))
 
         public_key = PublicKey(data)
         self.assertTrue(isinstance(public_key, _FixedByteArray))
         self.assertEqual(public_key.value, data)
 
-        data = bytes([i for i in range(_SECRET_KEY_BYTES_LEN)])
+        data = bytes(range(_SECRET_KEY_BYTES_LEN))
 
         secret_key = SecretKey(data)
         self.assertTrue(isinstance(secret_key, _FixedByteArray))
@@ -109,15 +114,15 @@ class TestCrypto(unittest.TestCase):
 
     def test_keypair(self) -> None:
         """Tests the KeyPair class."""
-        public_key = PublicKey(bytes([i for i in range(_PUBLIC_KEY_BYTES_LEN)]))
-        secret_key = SecretKey(bytes([i for i in range(_SECRET_KEY_BYTES_LEN)]))
+        public_key = PublicKey(bytes(range(_PUBLIC_KEY_BYTES_LEN)))
+        secret_key = SecretKey(bytes(range(_SECRET_KEY_BYTES_LEN)))
 
         # Check that creation with unmatched keys raises an error:
         with self.assertRaises(ValueError):
             KeyPair(public_key, secret_key)
 
         # Check that generation of the keypair works:
-        keypair = KeyPair.generate()
+        keypair = self.keypair
         self.assertTrue(isinstance(keypair.public_key, PublicKey))
         self.assertTrue(isinstance(keypair.secret_key, SecretKey))
         self.assertNotEqual(keypair.public_key, keypair.secret_key)
@@ -128,9 +133,9 @@ class TestCrypto(unittest.TestCase):
 
     def test_signature(self) -> None:
         """Tests the Signature class."""
-        keypair = KeyPair.generate()
+        keypair = self.keypair
 
-        data = bytes([i for i in range(10)])
+        data = bytes(range(10))
 
         signature = Signature.sign(data, keypair.secret_key)
 
@@ -141,6 +146,6 @@ class TestCrypto(unittest.TestCase):
         self.assertTrue(signature.verify(data, keypair.public_key))
 
         wrong_data = bytes([1, 2])
-        wrong_pk = PublicKey(bytes([i for i in range(_PUBLIC_KEY_BYTES_LEN)]))
+        wrong_pk = PublicKey(bytes(range(_PUBLIC_KEY_BYTES_LEN)))
         self.assertFalse(signature.verify(wrong_data, keypair.public_key))
         self.assertFalse(signature.verify(data, wrong_pk))
@@ -20,6 +20,30 @@ class TestExonumClient(unittest.TestCase):
             hostname=EXONUM_IP, public_api_port=EXONUM_PUBLIC_PORT, private_api_port=EXONUM_PRIVATE_PORT
         )
 
+    def test_shared_session(self):
+        service_public_api, service_private_api = self.client.service_apis("service")
+        exonum_api_provider = self.client.protobuf_provider._fallback[0]
+
+        for api in [self.client.public_api, self.client.private_api, service_public_api, service_private_api]:
+            self.assertIs(api._session, self.client._session)
+        self.assertIs(exonum_api_provider._session, self.client._session)
+
+    def test_close(self):
+        with patch.object(self.client._session, "close") as session_close:
+            self.client.close()
+
+        session_close.assert_called_once_with()
+
+    def test_context_manager(self):
+        with ExonumClient(hostname=EXONUM_IP, public_api_port=EXONUM_PUBLIC_PORT) as client:
+            self.assertIsInstance(client, ExonumClient)
+            session_close = Mock()
+            client._session.close = session_close
+
+            session_close.assert_not_called()
+
+        session_close.assert_called_once_with()
+
 
 # Subscriber tests
 class TestSubscriber(unittest.TestCase):
@@ -2,12 +2,15 @@
 # type: ignore
 
 import unittest
+import pickle
 import random
 import struct
 
 from exonum_client.proofs.encoder import build_encoder_function
-from exonum_client.proofs.map_proof import MapProof
+from exonum_client.proofs.map_proof import MapProof, CheckedMapProof, MalformedMapProofError
+from exonum_client.proofs.map_proof.optional_entry import OptionalEntry
 from exonum_client.proofs.map_proof.proof_path import ProofPath
+from exonum_client.proofs.map_proof.branch_node import BranchNode
 from exonum_client.proofs.map_proof.constants import KEY_SIZE
 from exonum_client.proofs.hasher import Hasher
 from exonum_client.module_manager import ModuleManager
@@ -69,6 +72,15 @@ class TestProofPath(unittest.TestCase):
             self.assertTrue(path_b < path_a)
             self.assertFalse(path_a < path_b)
             self.assertFalse(path_b > path_a)
+            self.assertTrue(path_a >= path_b)
+            self.assertTrue(path_b <= path_a)
+            self.assertFalse(path_a <= path_b)
+            self.assertFalse(path_b >= path_a)
+            self.assertTrue(path_a.compare(path_b) > 0)
+            self.assertTrue(path_b.compare(path_a) < 0)
+            self.assertEqual(path_a.compare(path_a), 0)
+            self.assertTrue(path_a <= path_a)
+            self.assertTrue(path_a >= path_a)
 
     def test_starts_with(self):
         data_bytes = bytearray([0] * KEY_SIZE)
@@ -97,6 +109,45 @@ class TestProofPath(unittest.TestCase):
 
         self.assertEqual(path_b, path_c)
 
+    def test_prefix_copy_on_write(self):
+        data_bytes = bytearray([0] * KEY_SIZE)
+        data_bytes[0] = 0b0011_0011
+        path = ProofPath.from_bytes(data_bytes)
+        path_bytes = path.as_bytes()
+
+        # Reading the prefix data does not affect the path:
+        prefix = path.prefix(8)
+        self.assertEqual(prefix.as_bytes()[1:-1], path_bytes[1:-1])
+        self.assertEqual(prefix.as_bytes()[-1], 8)
+        self.assertEqual(prefix.data_bytes[-1], 8)
+        self.assertEqual(path.as_bytes(), path_bytes)
+        self.assertTrue(path.is_leaf())
+
+        # Modifying the prefix does not affect the path:
+        prefix = path.prefix(8)
+        prefix.data_bytes[1] = 0b1111_1111
+        prefix.set_end(4)
+        self.assertEqual(prefix.key_int(), 0b1111_1111)
+        self.assertEqual(prefix.end(), 4)
+        self.assertEqual(path.as_bytes(), path_bytes)
+        self.assertEqual(path.key_int(), 0b0011_0011)
+        self.assertEqual(path.end(), 256)
+
+        # Modifying the path does not affect its prefix:
+        prefix = path.prefix(8)
+        path.data_bytes[1] = 0b1111_1111
+        path.set_end(16)
+        self.assertEqual(prefix.key_int(), 0b0011_0011)
+        self.assertEqual(prefix.end(), 8)
+        self.assertEqual(path.key_int(), 0b1111_1111)
+
+    def test_key_int_after_data_modification(self):
+        path = ProofPath.from_bytes(bytes(KEY_SIZE))
+        self.assertEqual(path.key_int(), 0)
+
+        path.data_bytes[1] = 1
+        self.assertEqual(path.key_int(), 1)
+
     def test_match_len(self):
         def _common_prefix_len(a, b):
             max_length = min(len(a), len(b))
@@ -185,6 +236,13 @@ class TestProofPath(unittest.TestCase):
 
             self.assertEqual(path, expected_path)
 
+    def test_parse_incorrect_path(self):
+        incorrect_path_strs = ["", "0" * 257, "0120", "a", "1 0", "+101", "1_0"]
+
+        for path_str in incorrect_path_strs:
+            with self.assertRaises(MalformedMapProofError):
+                ProofPath.parse(path_str)
+
 
 class TestMapProofParse(unittest.TestCase):
     def test_parse_full_tree(self):
@@ -218,6 +276,107 @@ class TestMapProofParse(unittest.TestCase):
 
         self.assertEqual(len(parsed_proof.proof), len(full_tree["proof"]))
 
+    def test_parse_malformed_proof_entries(self):
+        def mock_converter(_val):
+            return bytes()
+
+        correct_hash = "90c6641741113ce7cc75e5aeadeefdde21a123088e5b3650f6090117bbde543f"
+        malformed_entries = [
+            {"hash": correct_hash},
+            {"path": "0"},
+            {"path": 0, "hash": correct_hash},
+            {"path": "0", "hash": correct_hash[:-2]},
+            {"path": "0", "hash": correct_hash + "00"},
+            {"path": "0", "hash": " " + correct_hash[1:]},
+            {"path": "0", "hash": "zz" + correct_hash[2:]},
+            {"path": "0", "hash": None},
+        ]
+
+        for malformed_entry in malformed_entries:
+            proof = {"entries": [], "proof": [{"path": "1", "hash": correct_hash}, malformed_entry]}
+
+            with self.assertRaises(MalformedMapProofError):
+                MapProof.parse(proof, mock_converter, mock_converter)
+
+
+class TestCheckedMapProof(unittest.TestCase):
+    def test_entries(self):
+        # Entries with an empty value are considered missing:
+        entries = [
+            OptionalEntry("a", None),
+            OptionalEntry("b", b"value"),
+            OptionalEntry("c", b""),
+            OptionalEntry("d", "value"),
+        ]
+        checked_proof = CheckedMapProof(entries, Hash(Hasher.DEFAULT_HASH))
+
+        self.assertEqual([entry.key for entry in checked_proof.missing_keys()], ["a", "c"])
+        self.assertEqual([entry.key for entry in checked_proof.entries()], ["b", "d"])
+        self.assertEqual(checked_proof.all_entries(), entries)
+
+
+class TestMalformedMapProofError(unittest.TestCase):
+    def test_factories_messages(self):
+        error_kind = MalformedMapProofError.ErrorKind
+        cases = [
+            (
+                MalformedMapProofError.embedded_paths("0", "01"),
+                error_kind.EMBEDDED_PATH,
+                "Embedded path: prefix 0, path 01",
+            ),
+            (MalformedMapProofError.duplicate_path("01"), error_kind.DUPLICATE_PATH, "Duplicate path: path 01"),
+            (
+                MalformedMapProofError.invalid_ordering("1", "0"),
+                error_kind.INVALID_ORDERING,
+                "Invalid ordering: prev_path 1, path 0",
+            ),
+            (
+                MalformedMapProofError.non_terminal_node("01"),
+                error_kind.NON_TERMINAL_NODE,
+                "Non-terminal node: node 01",
+            ),
+            (MalformedMapProofError.malformed_entry("a"), error_kind.MALFORMED_ENTRY, "Malformed proof entry: entry a"),
+            (
+                MalformedMapProofError.malformed_entry("a", "info"),
+                error_kind.MALFORMED_ENTRY,
+                "Malformed proof entry: entry a [info]",
+            ),
+            (
+                MalformedMapProofError.invalid_key_size(b"ab"),
+                error_kind.INVALID_KEY_SIZE,
+                f"Invalid key 'b'ab'' for raw MapProof, expected size {KEY_SIZE}, actual 2",
+            ),
+        ]
+
+        # Every error kind has a factory:
+        self.assertEqual({kind for _, kind, _ in cases}, set(error_kind))
+
+        for error, kind, expected_message in cases:
+            self.assertEqual(error.error_data["kind"], kind)
+            self.assertEqual(str(error), expected_message)
+            # Message is available in the arguments after it was built:
+            self.assertEqual(error.args, (expected_message,))
+            self.assertEqual(str(error), expected_message)
+
+    def test_repr_and_pickle(self):
+        error = MalformedMapProofError.malformed_entry("a", "info")
+        self.assertEqual(repr(error), "MalformedMapProofError('Malformed proof entry: entry a [info]')")
+
+        error = MalformedMapProofError.duplicate_path("01")
+        restored_error = pickle.loads(pickle.dumps(error))
+
+        self.assertEqual(restored_error.args, ("Duplicate path: path 01",))
+        self.assertEqual(str(restored_error), "Duplicate path: path 01")
+        self.assertEqual(restored_error.error_data, error.error_data)
+
+    def test_constructor(self):
+        error_data = {"kind": MalformedMapProofError.ErrorKind.DUPLICATE_PATH, "path": "01"}
+        error = MalformedMapProofError("Custom message", error_data)
+
+        self.assertEqual(error.args, ("Custom message",))
+        self.assertEqual(str(error), "Custom message")
+        self.assertIs(error.error_data, error_data)
+
 
 class TestMapProof(PrecompiledModuleUserTestCase):
     def test_map_proof_validate_empty_proof(self):
@@ -404,6 +563,32 @@ class TestMapProof(PrecompiledModuleUserTestCase):
 
         self.assertEqual(actual_hash, expected_hash)
 
+    def test_hash_branch_node(self):
+        left_path = ProofPath.from_bytes(bytes([0b0000_0001] * KEY_SIZE)).prefix(10)
+        right_path = ProofPath.from_bytes(bytes([0b0000_0010] * KEY_SIZE))
+        left_hash = Hash(bytes([1] * KEY_SIZE))
+        right_hash = Hash(bytes([2] * KEY_SIZE))
+
+        branch = BranchNode()
+        branch.set_child("left", left_path, left_hash)
+        branch.set_child("right", right_path, right_hash)
+
+        actual_hash = Hasher.hash_map_branch_children(
+            left_hash, right_hash, left_path.as_bytes_compressed(), right_path.as_bytes_compressed()
+        )
+
+        raw_data = (
+            struct.pack("<B", Hasher.HashTag.MAP_BRANCH_NODE)
+            + left_hash.value
+            + right_hash.value
+            + left_path.as_bytes_compressed()
+            + right_path.as_bytes_compressed()
+        )
+        expected_hash = Hash.hash_data(raw_data)
+
+        self.assertEqual(actual_hash, expected_hash)
+        self.assertEqual(branch.object_hash(), expected_hash)
+
     def test_map_proof_validate_one_entry(self):
         """Here we check proof with one entry overall.
         It should calculate hashes using compressed path representation."""
@@ -0,0 +1,94 @@
+# pylint: disable=missing-docstring, protected-access
+# type: ignore
+
+import unittest
+
+from exonum_client.proofs.utils import is_field_hash, is_field_hash_or_none, leb128_encode_unsigned
+
+
+def _leb128_encode_reference(value):
+    result = []
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value != 0:
+            byte |= 0x80
+        result.append(byte)
+        if value == 0:
+            return bytes(result)
+
+
+class TestLeb128(unittest.TestCase):
+    def test_encode_unsigned(self):
+        cases = [
+            (0, b"\x00"),
+            (1, b"\x01"),
+            (0x7F, b"\x7f"),
+            (0x80, b"\x80\x01"),
+            (256, b"\x80\x02"),
+            (0x3FFF, b"\xff\x7f"),
+            (0x4000, b"\x80\x80\x01"),
+            (624485, b"\xe5\x8e\x26"),
+            (2 ** 64 - 1, b"\xff" * 9 + b"\x01"),
+        ]
+
+        for value, expected in cases:
+            self.assertEqual(leb128_encode_unsigned(value), expected)
+
+    def test_encode_unsigned_bit_lengths(self):
+        # Values around every power of two up to 2 ** 64:
+        for bits in range(65):
+            for value in (2 ** bits - 1, 2 ** bits, 2 ** bits + 1):
+                self.assertEqual(leb128_encode_unsigned(value), _leb128_encode_reference(value))
+
+    def test_encode_negative(self):
+        with self.assertRaises(ValueError):
+            leb128_encode_unsigned(-1)
+
+
+class TestHashFields(unittest.TestCase):
+    HASH = "90c6641741113ce7cc75e5aeadeefdde21a123088e5b3650f6090117bbde543f"
+
+    def test_valid_hashes(self):
+        valid_hashes = [self.HASH, self.HASH.upper(), "0" * 64, "aBcDeF0123456789" * 4]
+
+        for value in valid_hashes:
+            with self.subTest(value=value):
+                self.assertTrue(is_field_hash({"hash": value}, "hash"))
+                self.assertTrue(is_field_hash_or_none({"hash": value}, "hash"))
+
+    def test_invalid_hashes(self):
+        invalid_hashes = [
+            "",
+            self.HASH[:-1],
+            self.HASH + "0",
+            "g" + self.HASH[1:],
+            " " + self.HASH[1:],
+            self.HASH[:-1] + "\n",
+            self.HASH + "\n",
+            "\n" + self.HASH,
+            # Non-ASCII digits and letters:
+            "\u0660" + self.HASH[1:],
+            "\uff10" + self.HASH[1:],
+            "\uff21" + self.HASH[1:],
+            "\u00e9" + self.HASH[1:],
+            # Values of other types:
+            bytes.fromhex(self.HASH),
+            self.HASH.encode(),
+            0,
+            [self.HASH],
+            None,
+        ]
+
+        for value in invalid_hashes:
+            with self.subTest(value=value):
+                self.assertFalse(is_field_hash({"hash": value}, "hash"))
+
+        self.assertFalse(is_field_hash({}, "hash"))
+
+    def test_hash_or_none(self):
+        self.assertTrue(is_field_hash_or_none({}, "hash"))
+        self.assertTrue(is_field_hash_or_none({"hash": None}, "hash"))
+        self.assertTrue(is_field_hash_or_none({"hash": ""}, "hash"))
+        self.assertFalse(is_field_hash_or_none({"hash": self.HASH + "\n"}, "hash"))
+        self.assertFalse(is_field_hash_or_none({"hash": "g" * 64}, "hash"))
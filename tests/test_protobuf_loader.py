@@ -1,11 +1,12 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import sys
 import os
+import threading
 
 
 from exonum_client.module_manager import ModuleManager
-from exonum_client.protobuf_loader import ProtobufLoader
+from exonum_client.protobuf_loader import ProtobufLoader, ProtoFile
 from exonum_client.client import ExonumClient
 from .testing_utils import *
 
@@ -77,6 +78,32 @@ class TestProtobufLoader(unittest.TestCase):
             with self.assertRaises(ValueError):
                 client_2.protobuf_loader()
 
+    def test_protobuf_loader_concurrent_use(self):
+        # Test that the loader can be used from several threads simultaneously
+        # and that everything is cleaned up after use:
+        proto_dirs = set()
+        errors = []
+
+        def use_loader():
+            try:
+                for _ in range(20):
+                    with self.client.protobuf_loader() as loader:
+                        self.assertTrue(os.path.isdir(loader._proto_dir))
+                        proto_dirs.add(loader._proto_dir)
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        threads = [threading.Thread(target=use_loader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for proto_dir in proto_dirs:
+            self.assertFalse(os.path.exists(proto_dir))
+            self.assertFalse(proto_dir in sys.path)
+
     @patch("exonum_client.protobuf_provider.ExonumApiProvider.get", new=mock_requests_get)
     def test_main_sources_download(self):
         with self.client.protobuf_loader() as loader:
@@ -91,3 +118,20 @@ class TestProtobufLoader(unittest.TestCase):
             loader.load_service_proto_files(0, "exonum-supervisor", "1.0.0")
 
             _service_module = ModuleManager.import_service_module("exonum-supervisor", "1.0.0", "service")
+
+    def test_services_sources_error(self):
+        # Test that an error raised while obtaining sources for one of the services is propagated:
+        client = Mock()
+
+        def get_sources(_runtime_id, artifact_name, _artifact_version):
+            if artifact_name == "broken-service":
+                raise RuntimeError("Sources are not available")
+            return [ProtoFile(name="service.proto", content='syntax = "proto3";')]
+
+        client.get_proto_sources_for_artifact.side_effect = get_sources
+
+        with ProtobufLoader(client) as loader:
+            with self.assertRaisesRegex(RuntimeError, "Sources are not available"):
+                loader.load_services_proto_files([(0, "service", "1.0.0"), (0, "broken-service", "1.0.0")])
+
+        self.assertEqual(client.get_proto_sources_for_artifact.call_count, 2)
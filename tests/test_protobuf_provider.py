@@ -0,0 +1,297 @@
+# pylint: disable=missing-docstring, protected-access
+# type: ignore
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from requests.models import Response
+
+from exonum_client.protobuf_loader import ProtoFile
+from exonum_client.protobuf_provider import ProtobufProvider
+from exonum_client.protobuf_provider.filesystem import _FilesystemProtobufProvider
+from exonum_client.protobuf_provider.github import _GithubProtobufProvider
+
+MAIN_SOURCES_URL = "https://github.com/exonum/exonum/tree/v1.0.0/exonum/src/proto/schema"
+SERVICE_SOURCES_URL = "https://github.com/exonum/exonum/tree/v1.0.0/services/supervisor/src/proto"
+
+API_URL = "https://api.github.com/repos/exonum/exonum"
+RAW_URL = "https://raw.githubusercontent.com/exonum/exonum/v1.0.0"
+TREE_URL = API_URL + "/git/trees/v1.0.0?recursive=1"
+
+
+def _response(status_code, content):
+    response = Response()
+    response.status_code = status_code
+    response._content = content if isinstance(content, bytes) else json.dumps(content).encode("utf-8")
+
+    return response
+
+
+def _tree_entry(path, entry_type="blob"):
+    return {"path": path, "type": entry_type, "sha": "0" * 40}
+
+
+class TestGithubProtobufProvider(unittest.TestCase):
+    def _provider(self, url, responses, service_name="_main", service_version=""):
+        provider = _GithubProtobufProvider(service_name, service_version, url)
+
+        provider._session = Mock()
+        provider._session.get.side_effect = lambda url: responses.get(url, _response(404, {"message": "Not Found"}))
+
+        return provider
+
+    def test_valid_urls(self):
+        urls = [
+            (
+                "https://github.com/exonum/exonum/tree/master/exonum/src/proto",
+                "exonum/exonum",
+                "master",
+                "exonum/src/proto",
+            ),
+            ("https://github.com/exonum/exonum/tree/master/proto/", "exonum/exonum", "master", "proto/"),
+            ("https://github.com/exonum/exonum/tree/v1.0.0/a/b/c/d", "exonum/exonum", "v1.0.0", "a/b/c/d"),
+            ("https://github.com/exonum/exonum.git/tree/master/proto", "exonum/exonum.git", "master", "proto"),
+            (
+                "https://github.com/my_org-1/my.repo_2/tree/release-1.0_rc/proto",
+                "my_org-1/my.repo_2",
+                "release-1.0_rc",
+                "proto",
+            ),
+        ]
+
+        for url, repo, ref, path in urls:
+            with self.subTest(url=url):
+                provider = _GithubProtobufProvider("_main", "", url)
+
+                self.assertEqual((provider._repo, provider._ref, provider._path), (repo, ref, path))
+
+    def test_invalid_urls(self):
+        urls = [
+            "https://github.com/exonum/exonum/tree/master",
+            "https://github.com/exonum/exonum/tree/master/",
+            "https://github.com/exonum/exonum",
+            "https://github.com/exonum/exonum/blob/master/proto",
+            "https://github.com/exonum/exonum/extra/tree/master/proto",
+            "https://www.github.com/exonum/exonum/tree/master/proto",
+            "http://github.com/exonum/exonum/tree/master/proto",
+            "https://gitlab.com/exonum/exonum/tree/master/proto",
+            "https://github.company.com/exonum/exonum/tree/master/proto",
+            "https://githubXcom/exonum/exonum/tree/master/proto",
+            "https://github.com//exonum/tree/master/proto",
+            "https://github.com/exo num/exonum/tree/master/proto",
+            "https://github.com/exonum/exonum!/tree/master/proto",
+            "https://github.com/exonum/exonum/tree/mas?ter/proto",
+            "github.com/exonum/exonum/tree/master/proto",
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                with self.assertRaises(RuntimeError):
+                    _GithubProtobufProvider("_main", "", url)
+
+    def test_tree_discovery(self):
+        tree = [
+            _tree_entry("exonum/src/proto/schema", "tree"),
+            _tree_entry("exonum/src/proto/schema/exonum", "tree"),
+            _tree_entry("exonum/src/proto/schema/exonum/blockchain.proto"),
+            _tree_entry("exonum/src/proto/schema/exonum/README.md"),
+            _tree_entry("exonum/src/proto/schema_other/other.proto"),
+            _tree_entry("services/supervisor/src/proto/service.proto"),
+        ]
+        responses = {
+            TREE_URL: _response(200, {"tree": tree, "truncated": False}),
+            RAW_URL + "/exonum/src/proto/schema/exonum/blockchain.proto": _response(200, b"blockchain"),
+        }
+        provider = self._provider(MAIN_SOURCES_URL, responses)
+
+        sources = provider.get_main_proto_sources()
+
+        self.assertEqual(sources, [ProtoFile(name="exonum/proto/schema/exonum/blockchain.proto", content="blockchain")])
+        # Only the tree listing is requested from the API, files are downloaded via raw urls:
+        requested_urls = [call[0][0] for call in provider._session.get.call_args_list]
+        self.assertEqual([url for url in requested_urls if url.startswith(API_URL)], [TREE_URL])
+
+    def test_api_error(self):
+        rate_limit = {"message": "API rate limit exceeded", "documentation_url": "https://docs.github.com"}
+        provider = self._provider(MAIN_SOURCES_URL, {TREE_URL: _response(403, rate_limit)})
+
+        with self.assertRaisesRegex(RuntimeError, "API rate limit exceeded"):
+            provider.get_main_proto_sources()
+
+    def test_unexpected_api_response(self):
+        provider = self._provider(MAIN_SOURCES_URL, {TREE_URL: _response(200, {"message": "Unexpected"})})
+
+        with self.assertRaisesRegex(RuntimeError, "Unexpected response"):
+            provider.get_main_proto_sources()
+
+    def test_download_error(self):
+        tree = [_tree_entry("exonum/src/proto/schema/blockchain.proto")]
+        provider = self._provider(MAIN_SOURCES_URL, {TREE_URL: _response(200, {"tree": tree})})
+
+        with self.assertRaisesRegex(RuntimeError, "download a proto file"):
+            provider.get_main_proto_sources()
+
+    def test_truncated_tree_fallback(self):
+        # If the tree is too big, directories are listed one by one:
+        contents_url = API_URL + "/contents/{}?ref=v1.0.0"
+
+        def _dir_entry(path, entry_type):
+            download_url = RAW_URL + "/" + path if entry_type == "file" else None
+            return {"name": path.split("/")[-1], "path": path, "type": entry_type, "download_url": download_url}
+
+        responses = {
+            TREE_URL: _response(200, {"tree": [], "truncated": True}),
+            contents_url.format("services/supervisor/src/proto"): _response(
+                200,
+                [
+                    _dir_entry("services/supervisor/src/proto/service.proto", "file"),
+                    _dir_entry("services/supervisor/src/proto/README.md", "file"),
+                    _dir_entry("services/supervisor/src/proto/nested", "dir"),
+                ],
+            ),
+            contents_url.format("services/supervisor/src/proto/nested"): _response(
+                200, [_dir_entry("services/supervisor/src/proto/nested/config.proto", "file")]
+            ),
+            RAW_URL + "/services/supervisor/src/proto/service.proto": _response(200, b"service"),
+            RAW_URL + "/services/supervisor/src/proto/nested/config.proto": _response(200, b"config"),
+        }
+        provider = self._provider(SERVICE_SOURCES_URL, responses, "exonum-supervisor", "1.0.0")
+
+        sources = provider.get_proto_sources_for_artifact(0, "exonum-supervisor", "1.0.0")
+
+        self.assertEqual(
+            sources,
+            [ProtoFile(name="service.proto", content="service"), ProtoFile(name="config.proto", content="config")],
+        )
+
+    def test_file_names(self):
+        # Main sources keep the directory structure (without "src/"), service sources are stored in one directory:
+        tree = [
+            _tree_entry("exonum/src/proto/schema/exonum/blockchain.proto"),
+            _tree_entry("exonum/src/proto/schema/exonum/runtime/base.proto"),
+            _tree_entry("services/supervisor/src/proto/service.proto"),
+            _tree_entry("services/supervisor/src/proto/nested/config.proto"),
+        ]
+        responses = {TREE_URL: _response(200, {"tree": tree})}
+        for entry in tree:
+            responses[RAW_URL + "/" + entry["path"]] = _response(200, b"content")
+
+        main_provider = self._provider(MAIN_SOURCES_URL, responses)
+        self.assertEqual(
+            [source.name for source in main_provider.get_main_proto_sources()],
+            ["exonum/proto/schema/exonum/blockchain.proto", "exonum/proto/schema/exonum/runtime/base.proto"],
+        )
+
+        service_provider = self._provider(SERVICE_SOURCES_URL, responses, "exonum-supervisor", "1.0.0")
+        self.assertEqual(
+            [
+                source.name
+                for source in service_provider.get_proto_sources_for_artifact(0, "exonum-supervisor", "1.0.0")
+            ],
+            ["service.proto", "config.proto"],
+        )
+
+    def test_wrong_sources_type(self):
+        main_provider = self._provider(MAIN_SOURCES_URL, {})
+        service_provider = self._provider(SERVICE_SOURCES_URL, {}, "exonum-supervisor", "1.0.0")
+
+        with self.assertRaises(RuntimeError):
+            main_provider.get_proto_sources_for_artifact(0, "exonum-supervisor", "1.0.0")
+        with self.assertRaises(RuntimeError):
+            service_provider.get_main_proto_sources()
+        with self.assertRaises(RuntimeError):
+            service_provider.get_proto_sources_for_artifact(0, "exonum-supervisor", "2.0.0")
+
+        # No requests are made:
+        self.assertEqual(main_provider._session.get.call_count, 0)
+        self.assertEqual(service_provider._session.get.call_count, 0)
+
+
+class TestFilesystemProtobufProvider(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="exonum_client_test_")
+        self.sources_dir = os.path.join(self.temp_dir, "sources")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _create_file(self, path, content=b"content"):
+        path = os.path.join(self.temp_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file_out:
+            file_out.write(content)
+
+    def test_sources(self):
+        self._create_file("sources/a.proto", b"a")
+        self._create_file("sources/nested/b.proto", b"b")
+        self._create_file("sources/nested/deeper/c.proto", b"c")
+        self._create_file("sources/nested/readme.md")
+        # Hidden files and folders are skipped:
+        self._create_file("sources/.hidden.proto")
+        self._create_file("sources/.hidden/d.proto")
+        # Folders outside of the sources folder are included via symbolic links:
+        self._create_file("other/e.proto", b"e")
+        os.symlink(os.path.join(self.temp_dir, "other"), os.path.join(self.sources_dir, "nested", "linked"))
+
+        provider = _FilesystemProtobufProvider("_main", "", self.sources_dir)
+        sources = sorted(provider.get_main_proto_sources())
+
+        expected_sources = [
+            ProtoFile(name="a.proto", content="a"),
+            ProtoFile(name=os.path.join("nested", "b.proto"), content="b"),
+            ProtoFile(name=os.path.join("nested", "deeper", "c.proto"), content="c"),
+            ProtoFile(name=os.path.join("nested", "linked", "e.proto"), content="e"),
+        ]
+        self.assertEqual(sources, expected_sources)
+
+    def test_symlink_loop(self):
+        self._create_file("sources/a.proto", b"a")
+        self._create_file("sources/nested/b.proto", b"b")
+        os.symlink(self.sources_dir, os.path.join(self.sources_dir, "nested", "loop"))
+
+        provider = _FilesystemProtobufProvider("service", "1.0.0", self.sources_dir)
+        sources = sorted(provider.get_proto_sources_for_artifact(0, "service", "1.0.0"))
+
+        expected_sources = [
+            ProtoFile(name="a.proto", content="a"),
+            ProtoFile(name=os.path.join("nested", "b.proto"), content="b"),
+        ]
+        self.assertEqual(sources, expected_sources)
+
+    def test_incorrect_path(self):
+        with self.assertRaises(ValueError):
+            _FilesystemProtobufProvider("_main", "", os.path.join(self.temp_dir, "missing"))
+
+
+class TestProtobufProvider(unittest.TestCase):
+    def setUp(self):
+        self.fallback = Mock()
+        self.fallback.get_main_proto_sources.return_value = [ProtoFile(name="main.proto", content="main")]
+        self.fallback.get_proto_sources_for_artifact.return_value = [ProtoFile(name="service.proto", content="service")]
+
+        self.provider = ProtobufProvider()
+        self.provider.add_fallback_provider(ProtobufProvider.RUST_RUNTIME_ID, self.fallback)
+
+    def test_sources_are_cached(self):
+        # Test that sources are obtained from the fallback provider only once:
+        for _ in range(3):
+            main_sources = self.provider.get_main_proto_sources()
+            service_sources = self.provider.get_proto_sources_for_artifact(0, "exonum-supervisor", "1.0.0")
+
+            self.assertEqual(main_sources, [ProtoFile(name="main.proto", content="main")])
+            self.assertEqual(service_sources, [ProtoFile(name="service.proto", content="service")])
+
+        self.assertEqual(self.fallback.get_main_proto_sources.call_count, 1)
+        self.assertEqual(self.fallback.get_proto_sources_for_artifact.call_count, 1)
+
+    def test_invalidate(self):
+        # Test that sources are obtained again after the cache invalidation:
+        self.provider.get_main_proto_sources()
+        self.provider.invalidate()
+        self.provider.get_main_proto_sources()
+
+        self.assertEqual(self.fallback.get_main_proto_sources.call_count, 2)
@@ -2,11 +2,29 @@
 # type: ignore
 
 import unittest
+from unittest.mock import patch, Mock
 import os
 import tempfile
 import shutil
+import subprocess
 
-from exonum_client.protoc import Protoc
+from exonum_client.protoc import Protoc, _get_protoc_version, _find_files_recursive
+
+
+class _CountingPopen(subprocess.Popen):
+    # Counts protoc processes which are started, but not finished yet:
+    running = 0
+    max_running = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _CountingPopen.running += 1
+        _CountingPopen.max_running = max(_CountingPopen.max_running, _CountingPopen.running)
+
+    def communicate(self, *args, **kwargs):
+        result = super().communicate(*args, **kwargs)
+        _CountingPopen.running -= 1
+        return result
 
 
 class TestProtoc(unittest.TestCase):
@@ -54,4 +72,124 @@ class TestProtoc(unittest.TestCase):
                 expected_python_file = "{}_pb2.py".format(file_name)
                 self.assertTrue(expected_python_file in output_sources)
 
+    def test_modules_compile_many(self):
+        protoc = Protoc()
+
+        main_out_dir = os.path.join(self.out_dir, "main")
+        service_out_dir = os.path.join(self.out_dir, "service")
+        protoc.compile_many(
+            [(self.main_proto_dir, main_out_dir, None), (self.service_proto_dir, service_out_dir, self.main_proto_dir)]
+        )
+
+        for input_dirs, output_dir in [
+            ([self.main_proto_dir], main_out_dir),
+            ([self.service_proto_dir, self.main_proto_dir], service_out_dir),
+        ]:
+            output_sources = os.listdir(output_dir)
+
+            self.assertTrue("__init__.py" in output_sources)
+
+            for input_dir in input_dirs:
+                for file in os.listdir(input_dir):
+                    if file.endswith(".proto"):
+                        file_name = file.split(".")[0]
+
+                        expected_python_file = "{}_pb2.py".format(file_name)
+                        self.assertTrue(expected_python_file in output_sources)
+
+    @patch("exonum_client.protoc.PROTOC_MAX_PROCESSES", new=2)
+    def test_compile_many_processes_limit(self):
+        protoc = Protoc()
+        _CountingPopen.running = _CountingPopen.max_running = 0
+
+        sources = [(self.main_proto_dir, os.path.join(self.out_dir, str(idx)), None) for idx in range(5)]
+        with patch("subprocess.Popen", new=_CountingPopen):
+            protoc.compile_many(sources)
+
+        self.assertEqual(_CountingPopen.running, 0)
+        self.assertEqual(_CountingPopen.max_running, 2)
+        for _, output_dir, _ in sources:
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "exonum", "blockchain_pb2.py")))
+
+    @patch("exonum_client.protoc.PROTOC_MAX_PROCESSES", new=4)
+    def test_compile_many_startup_failure(self):
+        # Test that processes which are already started are stopped if the startup fails:
+        protoc = Protoc()
+        started_process = Mock()
+        started_process.communicate.return_value = (b"", b"")
+
+        sources = [
+            (self.main_proto_dir, os.path.join(self.out_dir, "main"), None),
+            (self.service_proto_dir, os.path.join(self.out_dir, "service"), self.main_proto_dir),
+        ]
+        with patch("subprocess.Popen", side_effect=[started_process, OSError("Popen failed")]):
+            with self.assertRaises(OSError):
+                protoc.compile_many(sources)
+
+        started_process.kill.assert_called_once()
+        started_process.communicate.assert_called_once()
+
+    @patch("exonum_client.protoc.PROTOC_MAX_PROCESSES", new=4)
+    def test_compile_many_compilation_failure(self):
+        # Test that processes of the other sets are stopped if waiting for one of the sets fails:
+        protoc = Protoc()
+        failed_process = Mock()
+        failed_process.communicate.side_effect = [OSError("communicate failed"), (b"", b"")]
+        running_process = Mock()
+        running_process.communicate.return_value = (b"", b"")
+
+        sources = [
+            (self.main_proto_dir, os.path.join(self.out_dir, "main"), None),
+            (self.service_proto_dir, os.path.join(self.out_dir, "service"), self.main_proto_dir),
+        ]
+        with patch("subprocess.Popen", side_effect=[failed_process, running_process]):
+            with self.assertRaises(OSError):
+                protoc.compile_many(sources)
+
+        running_process.kill.assert_called_once()
+        running_process.communicate.assert_called_once()
+        failed_process.kill.assert_called_once()
+
+    def test_protoc_version_is_cached(self):
+        os.makedirs(self.out_dir)
+        Protoc()
+        calls_before = _get_protoc_version.cache_info().misses
+
+        protoc = Protoc()
+
+        self.assertEqual(_get_protoc_version.cache_info().misses, calls_before)
+        self.assertEqual(_get_protoc_version.cache_info().currsize, 1)
+        protoc._ensure_protoc_version()
+
+    def test_compile_many_searches_folders_once(self):
+        # Test that the include folder shared by the compiled sets is searched once:
+        protoc = Protoc()
+        sources = [
+            (self.service_proto_dir, os.path.join(self.out_dir, str(idx)), self.main_proto_dir) for idx in range(3)
+        ]
+
+        with patch("exonum_client.protoc._find_files_recursive", wraps=_find_files_recursive) as find_files:
+            protoc.compile_many(sources)
+
+        searched_proto_folders = [call[0][0] for call in find_files.call_args_list if call[0][1] == ".proto"]
+        self.assertEqual(sorted(searched_proto_folders), sorted([self.service_proto_dir, self.main_proto_dir]))
+
+    def test_compile_changed_folder(self):
+        # Test that files added to the folder after the previous compilation are compiled:
+        protoc = Protoc()
+        proto_dir = os.path.join(self.out_dir, "proto")
+        os.makedirs(proto_dir)
+
+        with open(os.path.join(proto_dir, "first.proto"), "w") as proto_file:
+            proto_file.write('syntax = "proto3";\n')
+        protoc.compile(proto_dir, os.path.join(self.out_dir, "first"))
+
+        with open(os.path.join(proto_dir, "second.proto"), "w") as proto_file:
+            proto_file.write('syntax = "proto3";\n')
+        protoc.compile(proto_dir, os.path.join(self.out_dir, "second"))
+
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.out_dir, "second"))), ["__init__.py", "first_pb2.py", "second_pb2.py"]
+        )
+
     # TODO add negative tests
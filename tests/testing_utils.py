@@ -51,7 +51,7 @@ def mock_response(status_code, content=None):
     return response
 
 
-def mock_requests_get(cls_obj, url, params=None):
+def mock_requests_get(cls_obj, url, params=None, session=None):
     exonum_public_base = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PUBLIC_PORT)
     _exonum_private_base = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PRIVATE_PORT)
 
@@ -113,7 +113,7 @@ def mock_requests_get(cls_obj, url, params=None):
     return responses[(url, str(params))]
 
 
-def mock_requests_post(cls_obj, url, data=None, headers=None):
+def mock_requests_post(cls_obj, url, data=None, headers=None, session=None):
     exonum_public_base = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PUBLIC_PORT)
     _exonum_private_base = EXONUM_URL_BASE.format(EXONUM_PROTO, EXONUM_IP, EXONUM_PRIVATE_PORT)
 